@@ -9,16 +9,157 @@ the filter rules.
 WARNING: This modifies your existing emails. Make sure you have backups!
 """
 
-import email
+import argparse
+import functools
 import imaplib
+import mmap
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from email.header import decode_header
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 import yaml
 
+from create_folders import parse_list_response
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: fall back to scanning rules linearly
+    ahocorasick = None
+
+# Messages per FETCH command; large enough to amortize round-trips while
+# staying below typical server command-line limits
+DEFAULT_BATCH_SIZE = 100
+
+# Only the headers needed for rule matching; PEEK leaves the \Seen flag untouched
+HEADER_FETCH_ITEMS = "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)])"
+
+# Parallel IMAP connections when processing several source folders; kept
+# well below the per-user connection limits of common servers
+DEFAULT_MAX_CONNECTIONS = 4
+
+# UID data item in a FETCH response
+_UID_RE = re.compile(rb"\bUID (\d+)")
+
+# Upper bound on IDs per COPY/STORE/MOVE sequence set (RFC 2683 section 3.2.1.5)
+MAX_SEQUENCE_SET_SIZE = 1000
+
+# Rule block: if anyof (...) { fileinto "folder"; stop; }
+_RULE_RE = re.compile(rb'if\s+anyof\s*\((.*?)\)\s*\{\s*fileinto\s+"([^"]+)"\s*;', re.DOTALL)
+
+# Conditions inside an anyof block
+_DOMAIN_RE = re.compile(rb'address\s+:domain\s+:is\s+"from"\s+"([^"]+)"')
+_SUBJECT_RE = re.compile(rb'header\s+:contains\s+"subject"\s+"([^"]+)"')
+_FROM_RE = re.compile(rb'header\s+:contains\s+"from"\s+"([^"]+)"')
+
+
+def _quote_imap_string(value: str) -> str:
+    """Quote a value as an IMAP quoted string"""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _encode_uid_set(uids: List[bytes]) -> bytes:
+    """Encode UIDs as a compact IMAP sequence set, e.g. b"1:100,102,104:150"
+
+    Runs of consecutive UIDs collapse into ranges, which keeps the command
+    line short for large batches.
+    """
+    runs: List[List[int]] = []
+    for number in sorted({int(uid) for uid in uids}):
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+
+    return b",".join(
+        b"%d" % start if start == end else b"%d:%d" % (start, end) for start, end in runs
+    )
+
+
+def _parse_from_subject(raw_headers: bytes) -> Tuple[str, str]:
+    """Extract raw From and Subject values from a fetched header block
+
+    Only the two header lines are unfolded and decoded; the full MIME
+    parser is not needed for a HEADER.FIELDS response.
+    """
+    values = {b"from": b"", b"subject": b""}
+    current = None
+
+    for line in raw_headers.split(b"\r\n"):
+        if line[:1] in (b" ", b"\t"):
+            # Continuation of a folded header line
+            if current is not None:
+                values[current] += line
+            continue
+
+        name, sep, value = line.partition(b":")
+        current = name.strip().lower() if sep else None
+        if current in values:
+            values[current] = value.strip()
+        else:
+            current = None
+
+    return (
+        values[b"from"].decode("utf-8", errors="replace"),
+        values[b"subject"].decode("utf-8", errors="replace"),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_header(header: str) -> str:
+    """Decode email header
+
+    Cached because mailboxes repeat the same senders and subjects many times.
+    """
+    if not header:
+        return ""
+
+    decoded_parts = decode_header(header)
+
+    # Plain ASCII headers come back as a single str part
+    if len(decoded_parts) == 1 and isinstance(decoded_parts[0][0], str):
+        return decoded_parts[0][0]
+
+    result = []
+
+    for part, encoding in decoded_parts:
+        if isinstance(part, bytes):
+            try:
+                result.append(part.decode(encoding or "utf-8", errors="ignore"))
+            except Exception:
+                result.append(part.decode("utf-8", errors="ignore"))
+        else:
+            result.append(str(part))
+
+    return "".join(result)
+
+
+def _build_automaton(needles: List[Tuple[str, int]]):
+    """Build an Aho-Corasick automaton mapping each needle to its rule priority
+
+    Returns None if there are no needles.
+    """
+    if not needles:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for needle, priority in needles:
+        automaton.add_word(needle, priority)
+    automaton.make_automaton()
+    return automaton
+
+
+class FilterPlan(NamedTuple):
+    """Move decisions for one source folder, reusable on a later connection"""
+
+    uidvalidity: Optional[bytes]
+    total: int
+    moves: Dict[str, List[bytes]]
+
 
 class SieveFilterParser:
     """Parse Sieve filter rules from generated.sieve"""
@@ -31,44 +172,42 @@ class SieveFilterParser:
         """Parse Sieve filter and extract rules"""
         print(f"📖 Parsing Sieve filter: {self.sieve_file}")
 
-        with open(self.sieve_file, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(self.sieve_file, "rb") as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                print("✅ Parsed 0 filter rules")
+                return self.rules
 
-        # Extract each filter rule block
-        # Pattern: if anyof (...) { fileinto "folder"; stop; }
-        pattern = r'if\s+anyof\s*\((.*?)\)\s*\{\s*fileinto\s+"([^"]+)"\s*;'
-        matches = re.finditer(pattern, content, re.DOTALL)
+            # Match directly on the mapped bytes; only captures get decoded
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Extract each filter rule block
+                for match in _RULE_RE.finditer(content):
+                    conditions_block = match.group(1)
+                    target_folder = match.group(2).decode("utf-8")
 
-        for match in matches:
-            conditions_block = match.group(1)
-            target_folder = match.group(2)
+                    conditions = self._parse_conditions(conditions_block)
 
-            conditions = self._parse_conditions(conditions_block)
-
-            if conditions:
-                self.rules.append({"folder": target_folder, "conditions": conditions})
+                    if conditions:
+                        self.rules.append({"folder": target_folder, "conditions": conditions})
 
         print(f"✅ Parsed {len(self.rules)} filter rules")
         return self.rules
 
-    def _parse_conditions(self, conditions_block: str) -> List[Dict]:
+    def _parse_conditions(self, conditions_block: bytes) -> List[Dict]:
         """Parse individual conditions from the anyof block"""
         conditions = []
 
         # Pattern: address :domain :is "from" "example.com"
-        domain_pattern = r'address\s+:domain\s+:is\s+"from"\s+"([^"]+)"'
-        for match in re.finditer(domain_pattern, conditions_block):
-            conditions.append({"type": "from_domain", "value": match.group(1)})
+        for match in _DOMAIN_RE.finditer(conditions_block):
+            conditions.append({"type": "from_domain", "value": match.group(1).decode("utf-8")})
 
         # Pattern: header :contains "subject" "keyword"
-        subject_pattern = r'header\s+:contains\s+"subject"\s+"([^"]+)"'
-        for match in re.finditer(subject_pattern, conditions_block):
-            conditions.append({"type": "subject_contains", "value": match.group(1).lower()})
+        for match in _SUBJECT_RE.finditer(conditions_block):
+            conditions.append({"type": "subject_contains", "value": match.group(1).decode("utf-8").lower()})
 
         # Pattern: header :contains "from" "sender"
-        from_pattern = r'header\s+:contains\s+"from"\s+"([^"]+)"'
-        for match in re.finditer(from_pattern, conditions_block):
-            conditions.append({"type": "from_contains", "value": match.group(1).lower()})
+        for match in _FROM_RE.finditer(conditions_block):
+            conditions.append({"type": "from_contains", "value": match.group(1).decode("utf-8").lower()})
 
         return conditions
 
@@ -76,11 +215,53 @@ class SieveFilterParser:
 class RetroactiveFilterApplicator:
     """Apply parsed filter rules to existing emails"""
 
-    def __init__(self, imap_config: Dict, rules: List[Dict]):
+    def __init__(self, imap_config: Dict, rules: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE):
         self.config = imap_config
         self.rules = rules
+        self.batch_size = batch_size
         self.imap = None
+        self._known_folders: Set[str] = set()
         self.stats = {"processed": 0, "moved": 0, "errors": 0, "by_folder": {}}
+        self._index_conditions()
+
+    def _index_conditions(self):
+        """Group condition values by type, keyed to the priority of their rule
+
+        Values are lowercased and interned, and a value shared by several
+        rules is kept only for the first of them since it can never win for
+        a later rule. A sender domain becomes the From needle "@domain", the
+        same substring test the IMAP SEARCH path sends. Needles feed the
+        automata when available, otherwise they are stored as flat per-rule
+        tuples of From and Subject needles for a linear scan.
+        """
+        from_needles: Dict[str, int] = {}
+        subject_needles: Dict[str, int] = {}
+
+        for priority, rule in enumerate(self.rules):
+            for condition in rule["conditions"]:
+                value = sys.intern(condition["value"].lower())
+                if condition["type"] == "from_domain":
+                    from_needles.setdefault(sys.intern("@" + value), priority)
+                elif condition["type"] == "from_contains":
+                    from_needles.setdefault(value, priority)
+                elif condition["type"] == "subject_contains":
+                    subject_needles.setdefault(value, priority)
+
+        self._from_automaton = None
+        self._subject_automaton = None
+        self._compact_rules: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = ()
+
+        if ahocorasick is not None:
+            self._from_automaton = _build_automaton(list(from_needles.items()))
+            self._subject_automaton = _build_automaton(list(subject_needles.items()))
+            return
+
+        per_rule: List[Tuple[List[str], List[str]]] = [([], []) for _ in self.rules]
+        for value, priority in from_needles.items():
+            per_rule[priority][0].append(value)
+        for value, priority in subject_needles.items():
+            per_rule[priority][1].append(value)
+        self._compact_rules = tuple((tuple(froms), tuple(subjects)) for froms, subjects in per_rule)
 
     def connect(self):
         """Connect to IMAP server"""
@@ -94,6 +275,10 @@ class RetroactiveFilterApplicator:
         self.imap.login(self.config["username"], self.config["password"])
         print("✅ Connected successfully")
 
+        # Remember existing folders so moves only CREATE what is missing
+        status, folder_list = self.imap.list()
+        self._known_folders = parse_list_response(folder_list) if status == "OK" else set()
+
     def disconnect(self):
         """Disconnect from IMAP server"""
         if self.imap:
@@ -103,8 +288,18 @@ class RetroactiveFilterApplicator:
             except Exception:
                 pass
 
-    def apply_filters(self, source_folder: str = "INBOX", dry_run: bool = False):
-        """Apply filters to emails in source folder"""
+    def apply_filters(
+        self,
+        source_folder: str = "INBOX",
+        dry_run: bool = False,
+        plan: Optional[FilterPlan] = None,
+    ) -> Optional[FilterPlan]:
+        """Apply filters to emails in source folder
+
+        A plan returned by an earlier (dry) run can be passed in to move
+        exactly those emails without searching and fetching the folder again.
+        It is discarded if the folder's UIDVALIDITY changed in the meantime.
+        """
         print(f"\n📬 Processing emails in: {source_folder}")
         if dry_run:
             print("🔍 DRY RUN MODE - No emails will be moved\n")
@@ -113,127 +308,275 @@ class RetroactiveFilterApplicator:
         status, data = self.imap.select(source_folder)
         if status != "OK":
             print(f"❌ Failed to select folder: {source_folder}")
-            return
+            return None
+
+        _, validity = self.imap.response("UIDVALIDITY")
+        uidvalidity = validity[0] if validity and validity[0] else None
+
+        if plan is not None and (plan.uidvalidity is None or plan.uidvalidity != uidvalidity):
+            print("⚠️  Folder changed since the dry run, scanning again\n")
+            plan = None
+
+        if plan is None:
+            plan = self._plan_moves(source_folder, uidvalidity)
+            if plan is None:
+                return None
+        else:
+            print(f"📋 Reusing dry run results for {plan.total} emails\n")
+
+        if plan.total == 0:
+            return plan
 
-        # Get all email IDs
-        status, data = self.imap.search(None, "ALL")
+        self.stats["processed"] += plan.total
+
+        # Move matched emails with one command set per target folder
+        for target_folder, ids in plan.moves.items():
+            if dry_run or self._move_emails(ids, target_folder):
+                self.stats["moved"] += len(ids)
+                self.stats["by_folder"][target_folder] = (
+                    self.stats["by_folder"].get(target_folder, 0) + len(ids)
+                )
+            else:
+                self.stats["errors"] += len(ids)
+
+        print("\n" + "=" * 60)
+        self._print_statistics()
+        return plan
+
+    def _plan_moves(self, source_folder: str, uidvalidity: Optional[bytes]) -> Optional[FilterPlan]:
+        """Decide the target folder of every email in the selected folder"""
+        # Get all email UIDs; unlike sequence numbers they stay valid while
+        # messages are moved or expunged
+        status, data = self.imap.uid("SEARCH", None, "ALL")
         if status != "OK":
             print("❌ Failed to search emails")
-            return
+            return None
 
         email_ids = data[0].split()
         total_emails = len(email_ids)
 
         if total_emails == 0:
             print(f"📭 No emails found in {source_folder}")
-            return
+            return FilterPlan(uidvalidity, 0, {})
 
         print(f"📊 Found {total_emails} emails to process\n")
 
-        # Process each email
-        for i, email_id in enumerate(email_ids, 1):
-            self.stats["processed"] += 1
+        # Let the server evaluate the rules; fall back to local matching
+        by_folder_ids = self._match_with_search()
+        if by_folder_ids is None:
+            print("⚠️  Server-side search not available, matching headers locally\n")
+            by_folder_ids = self._match_with_fetch(email_ids)
+        else:
+            for target_folder, ids in by_folder_ids.items():
+                print(f"   ✉️  {len(ids)} emails → {target_folder}")
 
-            # Fetch email
-            status, data = self.imap.fetch(email_id, "(RFC822)")
-            if status != "OK":
-                self.stats["errors"] += 1
+        return FilterPlan(uidvalidity, total_emails, by_folder_ids)
+
+    def _match_with_search(self) -> Optional[Dict[str, List[bytes]]]:
+        """Resolve matching email IDs per rule with server-side SEARCH
+
+        Rules are evaluated in order and each email is assigned to the first
+        rule that matches it. Returns None if the server rejects a search, so
+        the caller can fall back to matching fetched headers locally.
+        """
+        by_folder_ids: Dict[str, List[bytes]] = {}
+        claimed = set()
+
+        for rule in self.rules:
+            criteria = self._build_search_criteria(rule["conditions"])
+            if criteria is None:
                 continue
 
-            # Parse email
-            msg = email.message_from_bytes(data[0][1])
-
-            # Extract headers
-            from_addr = self._decode_header(msg.get("From", ""))
-            subject = self._decode_header(msg.get("Subject", ""))
-
-            # Find matching rule
-            target_folder = self._find_matching_folder(from_addr, subject)
-
-            if target_folder:
-                # Show progress
-                print(f"[{i}/{total_emails}] ✉️  '{subject[:50]}...'")
-                print(f"           → Moving to: {target_folder}")
-
-                if not dry_run:
-                    # Move email
-                    if self._move_email(email_id, target_folder):
-                        self.stats["moved"] += 1
-                        self.stats["by_folder"][target_folder] = (
-                            self.stats["by_folder"].get(target_folder, 0) + 1
-                        )
-                    else:
-                        self.stats["errors"] += 1
-                else:
-                    self.stats["moved"] += 1
-                    self.stats["by_folder"][target_folder] = (
-                        self.stats["by_folder"].get(target_folder, 0) + 1
-                    )
-            else:
-                # No matching rule - show occasionally
-                if i % 50 == 0:
-                    print(f"[{i}/{total_emails}] Processing...")
+            charset = () if criteria.isascii() else ("CHARSET", "UTF-8")
+            try:
+                status, data = self.imap.uid("SEARCH", *charset, criteria.encode("utf-8"))
+            except imaplib.IMAP4.error:
+                return None
+            if status != "OK":
+                return None
 
-        print("\n" + "=" * 60)
-        self._print_statistics()
+            ids = [email_id for email_id in data[0].split() if email_id not in claimed]
+            if ids:
+                claimed.update(ids)
+                by_folder_ids.setdefault(rule["folder"], []).extend(ids)
 
-    def _find_matching_folder(self, from_addr: str, subject: str) -> Optional[str]:
-        """Find target folder based on filter rules"""
-        from_lower = from_addr.lower()
-        subject_lower = subject.lower()
+        return by_folder_ids
 
-        for rule in self.rules:
-            # Check if any condition matches
-            for condition in rule["conditions"]:
-                if condition["type"] == "from_domain":
-                    if f"@{condition['value']}" in from_lower:
-                        return rule["folder"]
+    @staticmethod
+    def _build_search_criteria(conditions: List[Dict]) -> Optional[str]:
+        """Translate anyof-style rule conditions to an IMAP SEARCH key"""
+        keys = []
 
-                elif condition["type"] == "subject_contains":
-                    if condition["value"] in subject_lower:
-                        return rule["folder"]
+        for condition in conditions:
+            if condition["type"] == "from_domain":
+                keys.append(f"FROM {_quote_imap_string('@' + condition['value'])}")
+            elif condition["type"] == "subject_contains":
+                keys.append(f"SUBJECT {_quote_imap_string(condition['value'])}")
+            elif condition["type"] == "from_contains":
+                keys.append(f"FROM {_quote_imap_string(condition['value'])}")
 
-                elif condition["type"] == "from_contains":
-                    if condition["value"] in from_lower:
-                        return rule["folder"]
+        if not keys:
+            return None
 
-        return None
+        # OR takes exactly two search keys, so nest them right to left
+        criteria = keys[-1]
+        for key in reversed(keys[:-1]):
+            criteria = f"OR {key} ({criteria})"
+
+        return criteria
+
+    def _match_with_fetch(self, email_ids: List[bytes]) -> Dict[str, List[bytes]]:
+        """Resolve matching email IDs by fetching headers and matching locally"""
+        by_folder_ids: Dict[str, List[bytes]] = {}
+        total_emails = len(email_ids)
+        i = 0
+        for batch_ids, headers in self._fetch_headers_batched(email_ids):
+            for email_id in batch_ids:
+                i += 1
+
+                raw_headers = headers.get(email_id)
+                if raw_headers is None:
+                    self.stats["errors"] += 1
+                    continue
+
+                # Extract headers
+                raw_from, raw_subject = _parse_from_subject(raw_headers)
+                from_addr = _decode_header(raw_from)
+                subject = _decode_header(raw_subject)
+
+                # Find matching rule
+                target_folder = self._find_matching_folder(from_addr, subject)
+
+                if target_folder:
+                    # Show progress
+                    print(f"[{i}/{total_emails}] ✉️  '{subject[:50]}...'")
+                    print(f"           → Moving to: {target_folder}")
+                    by_folder_ids.setdefault(target_folder, []).append(email_id)
+                else:
+                    # No matching rule - show occasionally
+                    if i % 50 == 0:
+                        print(f"[{i}/{total_emails}] Processing...")
+
+        return by_folder_ids
+
+    def _fetch_headers_batched(
+        self, email_ids: List[bytes]
+    ) -> Iterator[Tuple[List[bytes], Dict[bytes, bytes]]]:
+        """Fetch From/Subject headers for email UIDs in batches
+
+        Yields (batch_ids, headers) tuples where headers maps each UID to
+        its raw header block. The batch size is halved and the batch retried if
+        the server rejects the command line as too long.
+        """
+        batch_size = max(1, self.batch_size)
+        start = 0
+
+        while start < len(email_ids):
+            batch = email_ids[start : start + batch_size]
+            try:
+                status, data = self.imap.uid("FETCH", _encode_uid_set(batch), HEADER_FETCH_ITEMS)
+            except imaplib.IMAP4.error as e:
+                if "maximum request size exceeded" in str(e).lower() and batch_size > 1:
+                    batch_size = max(1, batch_size // 2)
+                    print(f"    ⚠️  Request too large, reducing batch size to {batch_size}")
+                    continue
+                raise
+
+            headers = self._parse_fetch_response(data) if status == "OK" else {}
+            yield batch, headers
+            start += len(batch)
+
+    @staticmethod
+    def _parse_fetch_response(data: List) -> Dict[bytes, bytes]:
+        """Map UIDs to header literals from a multi-message UID FETCH response"""
+        headers = {}
+        pending = None
+
+        for item in data:
+            # Literal responses come as (b'<seq> (UID <uid> BODY[...] {n}', b'<literal>'),
+            # followed by a b')' entry. Some servers send the UID after the
+            # literal instead, i.e. in that trailing b' UID <uid>)' entry.
+            if isinstance(item, tuple) and len(item) >= 2:
+                match = _UID_RE.search(item[0])
+                if match:
+                    headers[match.group(1)] = item[1]
+                    pending = None
+                else:
+                    pending = item[1]
+            elif isinstance(item, bytes) and pending is not None:
+                match = _UID_RE.search(item)
+                if match:
+                    headers[match.group(1)] = pending
+                pending = None
+
+        return headers
+
+    def _find_matching_folder(self, from_addr: str, subject: str) -> Optional[str]:
+        """Find target folder based on filter rules
+
+        The first rule (in filter order) with any matching condition wins.
+        """
+        from_lower = from_addr.lower()
+        subject_lower = subject.lower()
 
-    def _move_email(self, email_id: bytes, target_folder: str) -> bool:
-        """Move email to target folder"""
+        best = None
+        if ahocorasick is not None:
+            for automaton, text in (
+                (self._from_automaton, from_lower),
+                (self._subject_automaton, subject_lower),
+            ):
+                if automaton is None:
+                    continue
+                for _, priority in automaton.iter(text):
+                    if best is None or priority < best:
+                        best = priority
+        else:
+            for priority, (from_needles, subject_needles) in enumerate(self._compact_rules):
+                if any(needle in from_lower for needle in from_needles) or any(
+                    needle in subject_lower for needle in subject_needles
+                ):
+                    best = priority
+                    break
+
+        return self.rules[best]["folder"] if best is not None else None
+
+    def _move_emails(self, email_ids: List[bytes], target_folder: str) -> bool:
+        """Move a group of emails to the same target folder
+
+        Uses the MOVE extension when the server advertises it, otherwise
+        COPY followed by flagging the originals as deleted. Sequence sets are
+        capped at MAX_SEQUENCE_SET_SIZE IDs per command.
+        """
         try:
             # Create folder if it doesn't exist
-            self.imap.create(target_folder)
-
-            # Copy to target folder
-            result = self.imap.copy(email_id, target_folder)
-            if result[0] == "OK":
-                # Mark original as deleted
-                self.imap.store(email_id, "+FLAGS", "\\Deleted")
-                return True
-        except Exception as e:
-            print(f"    ❌ Error moving email: {e}")
+            if target_folder not in self._known_folders:
+                self.imap.create(target_folder)
+                self._known_folders.add(target_folder)
 
-        return False
+            use_move = "MOVE" in self.imap.capabilities
 
-    def _decode_header(self, header: str) -> str:
-        """Decode email header"""
-        if not header:
-            return ""
+            for start in range(0, len(email_ids), MAX_SEQUENCE_SET_SIZE):
+                message_set = _encode_uid_set(email_ids[start : start + MAX_SEQUENCE_SET_SIZE])
 
-        decoded_parts = decode_header(header)
-        result = []
+                if use_move:
+                    result = self.imap.uid("MOVE", message_set, target_folder)
+                    if result[0] != "OK":
+                        return False
+                    continue
 
-        for part, encoding in decoded_parts:
-            if isinstance(part, bytes):
-                try:
-                    result.append(part.decode(encoding or "utf-8", errors="ignore"))
-                except Exception:
-                    result.append(part.decode("utf-8", errors="ignore"))
-            else:
-                result.append(str(part))
+                # Copy to target folder
+                result = self.imap.uid("COPY", message_set, target_folder)
+                if result[0] != "OK":
+                    return False
+
+                # Mark originals as deleted
+                self.imap.uid("STORE", message_set, "+FLAGS", "\\Deleted")
+
+            return True
+        except Exception as e:
+            print(f"    ❌ Error moving emails to {target_folder}: {e}")
 
-        return "".join(result)
+        return False
 
     def _print_statistics(self):
         """Print processing statistics"""
@@ -253,8 +596,95 @@ class RetroactiveFilterApplicator:
                 print(f"   {folder}: {count}")
 
 
+def process_folder(
+    imap_config: Dict,
+    rules: List[Dict],
+    source_folder: str,
+    dry_run: bool,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    plan: Optional[FilterPlan] = None,
+) -> Optional[FilterPlan]:
+    """Apply filters to one source folder on a dedicated IMAP connection
+
+    Returns:
+        The move plan for the folder, to be reused after a dry run
+    """
+    applicator = RetroactiveFilterApplicator(imap_config, rules, batch_size)
+    try:
+        applicator.connect()
+        plan = applicator.apply_filters(source_folder, dry_run=dry_run, plan=plan)
+
+        if not dry_run:
+            # Expunge deleted emails
+            print(f"\n🗑️  Expunging deleted emails from {source_folder}...")
+            applicator.imap.expunge()
+    finally:
+        applicator.disconnect()
+
+    return plan
+
+
+def process_folders(
+    imap_config: Dict,
+    rules: List[Dict],
+    source_folders: List[str],
+    dry_run: bool,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    plans: Optional[List[Optional[FilterPlan]]] = None,
+) -> List[Optional[FilterPlan]]:
+    """Apply filters to several source folders over parallel IMAP connections
+
+    IMAP work is network-bound, so each folder gets its own connection and
+    the folders are processed concurrently, up to max_connections at once.
+
+    Returns:
+        The move plan per folder, in the order of source_folders
+    """
+    if plans is None:
+        plans = [None] * len(source_folders)
+
+    if len(source_folders) == 1:
+        return [
+            process_folder(imap_config, rules, source_folders[0], dry_run, batch_size, plans[0])
+        ]
+
+    workers = max(1, min(max_connections, len(source_folders)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_folder, imap_config, rules, folder, dry_run, batch_size, plan)
+            for folder, plan in zip(source_folders, plans)
+        ]
+        return [future.result() for future in futures]
+
+
 def main():
     """Main entry point"""
+    arg_parser = argparse.ArgumentParser(description="Apply Sieve filters to existing emails")
+    arg_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Number of emails fetched per IMAP command (default: {DEFAULT_BATCH_SIZE})",
+    )
+    arg_parser.add_argument(
+        "--source-folder",
+        action="append",
+        dest="source_folders",
+        help="Folder to apply filters to; repeat for several folders (default: INBOX)",
+    )
+    arg_parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help=(
+            "Maximum parallel IMAP connections when processing several folders "
+            f"(default: {DEFAULT_MAX_CONNECTIONS})"
+        ),
+    )
+    args = arg_parser.parse_args()
+    source_folders = args.source_folders or ["INBOX"]
+
     print("=" * 60)
     print("Apply Sieve Filters Retroactively")
     print("=" * 60)
@@ -289,8 +719,8 @@ def main():
         print(f"   {i}. {rule['folder']} ({len(rule['conditions'])} conditions)")
 
     # Ask for confirmation
-    print("\n⚠️  WARNING: This will move existing emails in your INBOX")
-    print("   Source folder: INBOX")
+    print("\n⚠️  WARNING: This will move existing emails in your mailbox")
+    print(f"   Source folders: {', '.join(source_folders)}")
     print(f"   Target folders: {len(rules)} different folders")
     print(f"   Server: {config['imap']['server']}")
 
@@ -302,11 +732,10 @@ def main():
         sys.exit(0)
 
     # Dry run
-    applicator = RetroactiveFilterApplicator(config["imap"], rules)
     try:
-        applicator.connect()
-        applicator.apply_filters(dry_run=True)
-        applicator.disconnect()
+        plans = process_folders(
+            config["imap"], rules, source_folders, True, args.batch_size, args.max_connections
+        )
     except Exception as e:
         print(f"\n❌ Error during dry run: {e}")
         sys.exit(1)
@@ -322,25 +751,24 @@ def main():
         print("❌ Cancelled. No emails were moved.")
         sys.exit(0)
 
-    # Apply filters for real
+    # Apply filters for real, reusing the dry run's decisions
     print("\n🚀 Applying filters to existing emails...")
-    applicator = RetroactiveFilterApplicator(config["imap"], rules)
     try:
-        applicator.connect()
-        applicator.apply_filters(dry_run=False)
-
-        # Expunge deleted emails
-        print("\n🗑️  Expunging deleted emails from INBOX...")
-        applicator.imap.expunge()
-
-        applicator.disconnect()
+        process_folders(
+            config["imap"],
+            rules,
+            source_folders,
+            False,
+            args.batch_size,
+            args.max_connections,
+            plans,
+        )
 
         print("\n✅ All done! Your existing emails have been organized.")
         print("   Check your email client to see the results.")
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        applicator.disconnect()
         sys.exit(1)
 
 
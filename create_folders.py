@@ -12,6 +12,12 @@ This script:
 import imaplib
 import re
 import sys
+from itertools import accumulate
+
+from src.shared.imap_list import parse_list_names
+
+# fileinto "folder/path" action in a Sieve script
+_FILEINTO_RE = re.compile(r'fileinto\s+"([^"]+)"')
 
 
 def extract_folders_from_sieve(sieve_file: str) -> list[str]:
@@ -23,23 +29,16 @@ def extract_folders_from_sieve(sieve_file: str) -> list[str]:
     Returns:
         List of unique folder paths
     """
-    folders = set()
-
     with open(sieve_file, "r", encoding="utf-8") as f:
         content = f.read()
 
     # Find all 'fileinto "folder/path"' statements
-    pattern = r'fileinto\s+"([^"]+)"'
-    matches = re.findall(pattern, content)
+    targets = set(_FILEINTO_RE.findall(content))
 
-    for folder_path in matches:
-        folders.add(folder_path)
-
-        # Also add parent folders
-        parts = folder_path.split("/")
-        for i in range(1, len(parts)):
-            parent = "/".join(parts[:i])
-            folders.add(parent)
+    # Also add parent folders: "A/B/C" -> "A", "A/B", "A/B/C"
+    folders = set()
+    for folder_path in targets:
+        folders.update(accumulate(folder_path.split("/"), lambda parent, part: f"{parent}/{part}"))
 
     return sorted(folders)
 
@@ -85,22 +84,24 @@ def get_existing_folders(conn) -> set[str]:
         if status != "OK":
             return set()
 
-        folders = set()
-        for folder_data in folder_list:
-            folder_str = folder_data.decode() if isinstance(folder_data, bytes) else folder_data
-            parts = folder_str.split('"')
-
-            if len(parts) >= 3:
-                folder_name = parts[-1].strip()
-                if folder_name:
-                    folders.add(folder_name)
-
-        return folders
+        return parse_list_response(folder_list)
     except Exception as e:
         print(f"⚠️  Error listing folders: {e}")
         return set()
 
 
+def parse_list_response(folder_list: list) -> set[str]:
+    """Extract mailbox names from a raw IMAP LIST response.
+
+    Args:
+        folder_list: Response data as returned by imaplib's list()
+
+    Returns:
+        Set of folder names
+    """
+    return set(parse_list_names(folder_list))
+
+
 def create_folder(conn, folder_name: str) -> bool:
     """Create a folder via IMAP.
 
@@ -206,44 +207,42 @@ def main():
     skipped = 0
     failed = 0
 
-    for folder in folders_to_create:
+    # Collect confirmed folders first, then create them in one pass
+    confirmed = []
+
+    for idx, folder in enumerate(folders_to_create):
         if folder in existing_folders:
             print(f"  ⏭️  '{folder}' - already exists, skipping")
             skipped += 1
-        else:
-            # Ask for individual permission
-            response = input(f"  ❓ Create '{folder}'? (y/n/all): ").lower()
-
-            if response == "all":
-                # Create this and all remaining without asking
-                if create_folder(conn, folder):
-                    print(f"  ✅ Created '{folder}'")
-                    created += 1
+            continue
+
+        # Ask for individual permission
+        response = input(f"  ❓ Create '{folder}'? (y/n/all): ").lower()
+
+        if response == "all":
+            # Confirm this and all remaining folders without asking
+            confirmed.append(folder)
+            for remaining_folder in folders_to_create[idx + 1 :]:
+                if remaining_folder in existing_folders:
+                    print(f"  ⏭️  '{remaining_folder}' - already exists, skipping")
+                    skipped += 1
                 else:
-                    print(f"  ❌ Failed to create '{folder}'")
-                    failed += 1
-
-                # Create remaining folders automatically
-                for remaining_folder in folders_to_create:
-                    if remaining_folder not in existing_folders and remaining_folder != folder:
-                        if create_folder(conn, remaining_folder):
-                            print(f"  ✅ Created '{remaining_folder}'")
-                            created += 1
-                        else:
-                            print(f"  ❌ Failed to create '{remaining_folder}'")
-                            failed += 1
-                break
-
-            elif response in ["y", "yes"]:
-                if create_folder(conn, folder):
-                    print(f"  ✅ Created '{folder}'")
-                    created += 1
-                else:
-                    print(f"  ❌ Failed to create '{folder}'")
-                    failed += 1
-            else:
-                print(f"  ⏭️  Skipped '{folder}'")
-                skipped += 1
+                    confirmed.append(remaining_folder)
+            break
+
+        elif response in ["y", "yes"]:
+            confirmed.append(folder)
+        else:
+            print(f"  ⏭️  Skipped '{folder}'")
+            skipped += 1
+
+    for folder in confirmed:
+        if create_folder(conn, folder):
+            print(f"  ✅ Created '{folder}'")
+            created += 1
+        else:
+            print(f"  ❌ Failed to create '{folder}'")
+            failed += 1
 
     # Disconnect
     conn.logout()
@@ -21,41 +21,42 @@ def example_pattern_detection():
     print("PATTERN DETECTION EXAMPLE")
     print("=" * 60)
 
-    # Create sample email collection
+    # Create sample email collection (one timestamp for the whole batch)
+    now = datetime.now(UTC)
     emails = [
         Email.create(
             sender=EmailAddress("noreply@amazon.com"),
             subject="Your order has been shipped",
             body="Your Amazon order #123 has shipped",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("orders@amazon.com"),
             subject="Order confirmation",
             body="Thank you for your Amazon order",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("newsletter@github.com"),
             subject="GitHub Newsletter - Weekly Digest",
             body="Here's your weekly GitHub digest",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("notifications@github.com"),
             subject="New pull request opened",
             body="A new PR has been opened on your repository",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("support@stripe.com"),
             subject="Payment received",
             body="You received a payment of $100",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
     ]
@@ -167,8 +168,7 @@ def example_filter_testing(sieve_filter, emails):
 
     # Find unmatched emails
     print("\nUnmatched emails:")
-    unmatched = matcher.find_unmatched_emails(sieve_filter, emails)
-    for email in unmatched:
+    for email in test_result.unmatched_emails:
         print(f"  - {email.subject} (from {email.sender.value})")
 
     # Simulate actions for matched emails
@@ -192,27 +192,28 @@ def example_direct_pattern_usage():
     print("DIRECT PATTERN TO FILTER EXAMPLE")
     print("=" * 60)
 
-    # Create sample emails
+    # Create sample emails (one timestamp for the whole batch)
+    now = datetime.now(UTC)
     emails = [
         Email.create(
             sender=EmailAddress("news@newsletter.com"),
             subject="Weekly Newsletter",
             body="Your weekly newsletter",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("updates@newsletter.com"),
             subject="Newsletter Updates",
             body="New newsletter content",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
         Email.create(
             sender=EmailAddress("daily@newsletter.com"),
             subject="Daily Newsletter",
             body="Daily newsletter digest",
-            received_date=datetime.now(UTC),
+            received_date=now,
             folder="INBOX",
         ),
     ]
@@ -225,9 +226,10 @@ def example_direct_pattern_usage():
 
     # Convert detected patterns to CategoryPattern objects
     category_patterns = []
+    index = detector.build_email_index(emails)
     for pattern in patterns[:3]:  # Take top 3
         suggested_folder = detector.suggest_folder_for_pattern(
-            detector.group_emails_by_pattern(emails, pattern), pattern
+            detector.group_emails_by_pattern(emails, pattern, index), pattern
         )
 
         # Convert detected pattern to category pattern
@@ -4,7 +4,11 @@ This example demonstrates how to use the new hexagonal architecture
 domain layer to create emails, filters, and generate Sieve scripts.
 """
 
-from datetime import datetime
+import contextlib
+import io
+import sys
+from datetime import UTC, datetime
+
 from src.domain.entities.email import Email
 from src.domain.entities.sieve_filter import SieveFilter
 from src.domain.value_objects.filter_condition import FilterCondition
@@ -12,6 +16,14 @@ from src.domain.value_objects.filter_action import FilterAction
 from src.domain.value_objects.filter_rule import FilterRule
 from src.domain.value_objects.email_pattern import EmailPattern
 
+_BANNER = (
+    "\n"
+    "╔" + "=" * 58 + "╗\n"
+    "║" + " " * 10 + "Hexagonal Architecture Examples" + " " * 16 + "║\n"
+    "║" + " " * 18 + "Domain Layer Usage" + " " * 20 + "║\n"
+    "╚" + "=" * 58 + "╝\n"
+)
+
 
 def example_create_email():
     """Example: Creating an Email entity."""
@@ -25,7 +37,7 @@ def example_create_email():
         subject="Important: Q4 Budget Review",
         body="Please review the attached Q4 budget document...",
         folder="INBOX",
-        received_at=datetime.now()
+        received_at=datetime.now(UTC),
     )
 
     print(f"Email created: {email}")
@@ -180,33 +192,40 @@ def example_email_pattern_matching():
         recipients=["user@example.com"],
         subject="Your Amazon Order Has Shipped",
         body="Your order #12345 has been shipped",
-        folder="INBOX"
+        folder="INBOX",
+        received_at=datetime.now(UTC),
     )
 
+    # Batch API: one row per email, one column per pattern
+    (matches,) = Email.matches_patterns_batch([email], [pattern1, pattern2])
+
     print(f"Email: {email}")
-    print(f"Matches pattern 1: {email.matches_pattern(pattern1)}")
-    print(f"Matches pattern 2: {email.matches_pattern(pattern2)}")
+    print(f"Matches pattern 1: {matches[0]}")
+    print(f"Matches pattern 2: {matches[1]}")
     print()
 
 
 def main():
-    """Run all examples."""
-    print()
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 10 + "Hexagonal Architecture Examples" + " " * 16 + "║")
-    print("║" + " " * 18 + "Domain Layer Usage" + " " * 20 + "║")
-    print("╚" + "=" * 58 + "╝")
-    print()
-
-    example_create_email()
-    example_create_filter_conditions()
-    example_create_filter_actions()
-    example_create_complete_filter()
-    example_email_pattern_matching()
-
-    print("=" * 60)
-    print("All examples completed successfully!")
-    print("=" * 60)
+    """Run all examples.
+
+    Output is collected in memory and written to stdout in one go, so
+    piping the examples into a file or CI log doesn't pay for a write
+    per ``print()`` call.
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as buf:
+        print(_BANNER)
+
+        example_create_email()
+        example_create_filter_conditions()
+        example_create_filter_actions()
+        example_create_complete_filter()
+        example_email_pattern_matching()
+
+        print("=" * 60)
+        print("All examples completed successfully!")
+        print("=" * 60)
+
+    sys.stdout.write(buf.getvalue())
 
 
 if __name__ == "__main__":
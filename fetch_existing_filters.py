@@ -6,17 +6,71 @@ This script connects to your mail server and retrieves existing
 Sieve filters so they can be included in the AI analysis.
 """
 
+import functools
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional: the sidecar cache falls back to stdlib json
+    orjson = None
 
+# Parallel ManageSieve sessions used to fetch script contents
+MAX_MANAGESIEVE_CONNECTIONS = 4
+
+# Sidecar file (next to the summary) with content hashes and parsed rules
+SIEVE_CACHE_FILE = ".sieve_hashes.json"
+
+# Version of parse_sieve_rules output stored in the cache; bump it whenever
+# the parser changes so cached parses from older versions are discarded
+SIEVE_PARSER_VERSION = 2
+
+# First characters of lines parse_sieve_rules needs to look at: comments,
+# if/fileinto/address/header/stop, and bracket-led clause or block lines
+_RELEVANT_LINE_STARTS = frozenset("#ifahs}({")
+
+# Fallback patterns for rules that put several clauses on one line
+# One alternation for all three clause kinds so a rule is scanned once;
+# m.lastindex tells which branch matched (1 fileinto, 2 domain, 4 header).
+_RE_CLAUSE = re.compile(
+    r'fileinto\s+"([^"]+)"'
+    r'|address :domain :is "from" "([^"]+)"'
+    r'|header :contains "([^"]+)" "([^"]+)"',
+    re.ASCII,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedRule:
+    """A filter rule extracted from an existing Sieve script."""
+
+    description: str
+    folder: str
+    conditions: tuple[str, ...]
+    rule_text: str | None = None
+
+
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.yml."""
+    """Load configuration from config.yml.
+
+    The result is cached, so repeated calls parse the file only once.
+    """
     try:
         import yaml
 
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader
+
         config_file = Path(__file__).parent / "config" / "config.yml"
         with open(config_file, "r") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         return config
     except Exception as e:
@@ -24,6 +78,26 @@ def load_config():
         return None
 
 
+def _fetch_scripts(conn, names: list[str]) -> dict[str, str]:
+    """Fetch the content of several scripts over one ManageSieve connection.
+
+    Args:
+        conn: Logged-in ManageSieve connection
+        names: Script names to fetch
+
+    Returns:
+        Dict of script name to content (always str)
+    """
+    contents = {}
+    for name in names:
+        content = conn.getscript(name)
+        # Some managesieve versions hand back bytes; decode once here
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", "replace")
+        contents[name] = content
+    return contents
+
+
 def fetch_via_managesieve(server: str, username: str, password: str, port: int = 4190):
     """Fetch filters via ManageSieve protocol.
 
@@ -39,23 +113,56 @@ def fetch_via_managesieve(server: str, username: str, password: str, port: int =
     try:
         from managesieve import MANAGESIEVE
 
+        def connect():
+            conn = MANAGESIEVE(server, port)
+            conn.login(username, password)
+            return conn
+
         print(f"📡 Connecting to ManageSieve server {server}:{port}...")
-        conn = MANAGESIEVE(server, port)
-        conn.login(username, password)
+        conn = connect()
         print("✅ Connected")
 
         # List all scripts
         scripts = conn.listscripts()
         print(f"📋 Found {len(scripts)} Sieve scripts")
 
-        all_scripts = {}
         for script_name, is_active in scripts:
             marker = " (ACTIVE)" if is_active else ""
             print(f"   • {script_name}{marker}")
 
-            # Fetch script content
-            content = conn.getscript(script_name)
-            all_scripts[script_name] = {"content": content, "active": is_active}
+        names = [script_name for script_name, _ in scripts]
+
+        # Fetch script contents; each worker owns one connection since a
+        # ManageSieve session cannot be shared between threads
+        workers = min(MAX_MANAGESIEVE_CONNECTIONS, len(names))
+        if workers <= 2:
+            contents = _fetch_scripts(conn, names)
+        else:
+            conns = [conn]
+            try:
+                # Opened inside the try so a failed login still logs out
+                # the connections opened before it
+                for _ in range(workers - 1):
+                    conns.append(connect())
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(_fetch_scripts, worker_conn, names[i::workers])
+                        for i, worker_conn in enumerate(conns)
+                    ]
+                    contents = {}
+                    for future in futures:
+                        contents.update(future.result())
+            finally:
+                for worker_conn in conns[1:]:
+                    try:
+                        worker_conn.logout()
+                    except Exception:
+                        pass
+
+        # Keys are known up front; fill them in listing order
+        all_scripts = dict.fromkeys(names)
+        for script_name, is_active in scripts:
+            all_scripts[script_name] = {"content": contents[script_name], "active": is_active}
 
         conn.logout()
         return all_scripts
@@ -115,86 +222,226 @@ def fetch_via_imap_metadata(
         return None
 
 
-def parse_sieve_rules(script_content: str):
+def _quoted_args(text: str, count: int) -> tuple[list[str], str] | None:
+    """Slice the first `count` double-quoted strings off the start of text.
+
+    Args:
+        text: Text starting at (or just before) the first quoted argument
+        count: Number of quoted arguments to extract
+
+    Returns:
+        Tuple of (arguments, remaining text), or None if arguments are missing
+    """
+    args = []
+    pos = 0
+    for _ in range(count):
+        start = text.find('"', pos)
+        if start == -1:
+            return None
+        end = text.find('"', start + 1)
+        if end == -1:
+            return None
+        args.append(text[start + 1 : end])
+        pos = end + 1
+    return args, text[pos:]
+
+
+def _strip_test_prefix(stripped: str) -> str:
+    """Drop leading `if`, `anyof`/`allof` and bracket syntax from a Sieve line."""
+    if stripped.startswith("if "):
+        stripped = stripped[3:].lstrip()
+    if stripped.startswith(("anyof", "allof")):
+        stripped = stripped[5:].lstrip()
+    return stripped.lstrip("({ \t")
+
+
+def _parse_rule_text_regex(rule_text: str) -> tuple[str, list[str]]:
+    """Extract folder and conditions from a complete rule with regexes.
+
+    Fallback for rules that do not put one clause per line.
+    """
+    folder = None
+    domains = []
+    headers = []
+    for m in _RE_CLAUSE.finditer(rule_text):
+        group = m.lastindex
+        if group == 1:
+            if folder is None:
+                folder = m.group(1)
+        elif group == 2:
+            domains.append(f"from:{m.group(2)}")
+        else:
+            headers.append(f"{m.group(3)}:{m.group(4)}")
+
+    # Domain conditions are listed before header conditions
+    conditions = domains + headers
+    if folder is None:
+        folder = "INBOX"
+
+    return folder, conditions
+
+
+def parse_sieve_rules(script_content: str, include_text: bool = False) -> list[ParsedRule]:
     """Parse Sieve script and extract rules.
 
+    Clauses are tokenized line by line: each line is dispatched on its
+    leading keyword and the quoted arguments are sliced out directly. Rules
+    that put several clauses on one line fall back to regex extraction.
+
     Args:
         script_content: Sieve script content
+        include_text: Also return the raw text of each rule (as `rule_text`,
+            None otherwise)
 
     Returns:
-        List of rule dictionaries
+        List of parsed rules
     """
     if not script_content:
         return []
 
     rules = []
-    lines = script_content.split("\n")
-    current_description = ""
+    lines = script_content.splitlines()
+    desc_parts: list[str] = []
     in_rule = False
-    current_rule = []
+    start_idx = 0
+    folder = None
+    conditions = []
+    saw_stop = False
+    needs_regex = False
 
-    for line in lines:
+    for idx, line in enumerate(lines):
         stripped = line.strip()
 
+        # Only comments, clauses, brackets and "stop;" matter; skip the rest
+        # (blank lines, require, closing parentheses) before any dispatch
+        if not stripped or stripped[0] not in _RELEVANT_LINE_STARTS:
+            continue
+
         # Extract comments
         if stripped.startswith("#"):
             comment = stripped[1:].strip()
             if comment and not comment.startswith("=") and not comment.startswith("Rule:"):
                 if "Description:" in comment:
-                    current_description = comment.split("Description:")[1].strip()
+                    description = comment.split("Description:")[1].strip()
+                    desc_parts = [description] if description else []
                 elif "Rule:" in comment:
                     # Skip rule headers
                     pass
-                elif current_description:
-                    current_description += " " + comment
                 else:
-                    current_description = comment
+                    desc_parts.append(comment)
+            continue
 
         # Detect rule start
-        elif stripped.startswith("if "):
+        if stripped.startswith("if "):
             in_rule = True
-            current_rule = [line]
-
-        # Inside rule
-        elif in_rule:
-            current_rule.append(line)
-            # Check for rule end
-            if "}" in stripped and "stop;" in stripped:
-                # Rule complete
-                rule_text = "\n".join(current_rule)
-
-                # Extract destination folder
-                import re
-
-                folder_match = re.search(r'fileinto\s+"([^"]+)"', rule_text)
-                folder = folder_match.group(1) if folder_match else "INBOX"
-
-                # Extract conditions
-                conditions = []
-                if "address :domain :is" in rule_text:
-                    domain_matches = re.findall(r'address :domain :is "from" "([^"]+)"', rule_text)
-                    conditions.extend([f"from:{domain}" for domain in domain_matches])
-
-                if "header :contains" in rule_text:
-                    header_matches = re.findall(r'header :contains "([^"]+)" "([^"]+)"', rule_text)
-                    conditions.extend([f"{header}:{value}" for header, value in header_matches])
-
-                rules.append(
-                    {
-                        "description": current_description or "Unknown rule",
-                        "folder": folder,
-                        "conditions": conditions,
-                        "rule_text": rule_text,
-                    }
+            start_idx = idx
+            folder = None
+            conditions = []
+            saw_stop = False
+            needs_regex = False
+        elif not in_rule:
+            continue
+
+        # Tokenize the clause at the start of the line
+        clause = _strip_test_prefix(stripped)
+        parsed = None
+        if clause.startswith("fileinto"):
+            parsed = _quoted_args(clause[8:], 1)
+            if parsed and folder is None:
+                folder = parsed[0][0]
+        elif clause.startswith('address :domain :is "from"'):
+            parsed = _quoted_args(clause[26:], 1)
+            if parsed:
+                conditions.append(f"from:{parsed[0][0]}")
+        elif clause.startswith("header :contains"):
+            parsed = _quoted_args(clause[16:], 2)
+            if parsed:
+                conditions.append(f"{parsed[0][0]}:{parsed[0][1]}")
+
+        rest = parsed[1] if parsed else clause
+        if '"' in rest:
+            # More quoted arguments than one clause accounts for
+            needs_regex = True
+
+        if "stop;" in stripped:
+            saw_stop = True
+
+        # Check for rule end
+        if saw_stop and "}" in stripped:
+            # Rule complete; only join its lines when they are needed
+            rule_text = None
+            if needs_regex or include_text:
+                rule_text = "\n".join(lines[start_idx : idx + 1])
+
+            if needs_regex:
+                folder, conditions = _parse_rule_text_regex(rule_text)
+
+            rules.append(
+                ParsedRule(
+                    description=" ".join(desc_parts) or "Unknown rule",
+                    folder=folder or "INBOX",
+                    conditions=tuple(conditions),
+                    rule_text=rule_text if include_text else None,
                 )
+            )
 
-                current_description = ""
-                in_rule = False
-                current_rule = []
+            desc_parts = []
+            in_rule = False
 
     return rules
 
 
+def _script_hash(content: str) -> str:
+    """Return a short content digest used to detect unchanged scripts."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _is_valid_cache_entry(entry) -> bool:
+    """Check that a parse cache entry has the shape save_existing_filters writes."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("hash"), str)
+        and isinstance(entry.get("rules"), list)
+        and all(
+            isinstance(rule, dict)
+            and isinstance(rule.get("description"), str)
+            and isinstance(rule.get("folder"), str)
+            and isinstance(rule.get("conditions"), list)
+            and all(isinstance(cond, str) for cond in rule["conditions"])
+            for rule in entry["rules"]
+        )
+    )
+
+
+def _load_parse_cache(cache_path: Path) -> dict:
+    """Load cached parse results keyed by script name, or {} if unavailable.
+
+    A cache written by another SIEVE_PARSER_VERSION is discarded as a whole,
+    and malformed entries are dropped, so their scripts are parsed again.
+    """
+    try:
+        data = cache_path.read_bytes()
+        cache = orjson.loads(data) if orjson else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("parser_version") != SIEVE_PARSER_VERSION:
+        return {}
+    scripts = cache.get("scripts")
+    if not isinstance(scripts, dict):
+        return {}
+    return {name: entry for name, entry in scripts.items() if _is_valid_cache_entry(entry)}
+
+
+def _save_parse_cache(cache_path: Path, cache: dict) -> None:
+    """Persist parse results keyed by script name; failures only cost a reparse."""
+    cache = {"parser_version": SIEVE_PARSER_VERSION, "scripts": cache}
+    data = orjson.dumps(cache) if orjson else json.dumps(cache).encode("utf-8")
+    try:
+        cache_path.write_bytes(data)
+    except OSError as e:
+        print(f"⚠️  Could not save parse cache {cache_path}: {e}")
+
+
 def save_existing_filters(scripts: dict, output_file: str = "output/existing_filters.txt"):
     """Save existing filters to file for AI analysis.
 
@@ -205,40 +452,71 @@ def save_existing_filters(scripts: dict, output_file: str = "output/existing_fil
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("=" * 70 + "\n")
-        f.write("EXISTING SIEVE FILTERS\n")
-        f.write("=" * 70 + "\n\n")
+    # Scripts whose content hash is unchanged since the last run reuse the
+    # cached rules instead of being parsed again
+    cache_path = output_path.parent / SIEVE_CACHE_FILE
+    prior_cache = _load_parse_cache(cache_path)
+    cache = {}
+
+    parts: list[str] = []
+    parts.append("=" * 70 + "\n")
+    parts.append("EXISTING SIEVE FILTERS\n")
+    parts.append("=" * 70 + "\n\n")
+
+    for script_name, script_data in scripts.items():
+        content = script_data["content"]
+        is_active = script_data["active"]
+
+        parts.append(f"\n## Script: {script_name}\n")
+        parts.append(f"Status: {'ACTIVE' if is_active else 'Inactive'}\n")
+        parts.append("-" * 70 + "\n\n")
+
+        # Parse rules
+        digest = _script_hash(content)
+        cached = prior_cache.get(script_name)
+        if cached and cached.get("hash") == digest:
+            rules = [
+                ParsedRule(rule["description"], rule["folder"], tuple(rule["conditions"]))
+                for rule in cached["rules"]
+            ]
+        else:
+            rules = parse_sieve_rules(content)
 
-        for script_name, script_data in scripts.items():
-            content = script_data["content"]
-            is_active = script_data["active"]
+        cache[script_name] = {
+            "hash": digest,
+            "rules": [
+                {
+                    "description": rule.description,
+                    "folder": rule.folder,
+                    "conditions": list(rule.conditions),
+                }
+                for rule in rules
+            ],
+        }
+
+        if rules:
+            parts.append(f"Found {len(rules)} filter rules:\n\n")
+            for i, rule in enumerate(rules, 1):
+                parts.append(f"{i}. {rule.description}\n")
+                parts.append(f"   → Folder: {rule.folder}\n")
+                if rule.conditions:
+                    parts.append(f"   → Conditions:\n")
+                    for cond in rule.conditions:
+                        parts.append(f"      - {cond}\n")
+                parts.append("\n")
+        else:
+            parts.append("No rules found (empty or custom script)\n\n")
 
-            f.write(f"\n## Script: {script_name}\n")
-            f.write(f"Status: {'ACTIVE' if is_active else 'Inactive'}\n")
-            f.write("-" * 70 + "\n\n")
+        # Also save full script
+        parts.append("Full script:\n")
+        parts.append("```sieve\n")
+        parts.append(content)
+        parts.append("\n```\n\n")
 
-            # Parse rules
-            rules = parse_sieve_rules(content)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
-            if rules:
-                f.write(f"Found {len(rules)} filter rules:\n\n")
-                for i, rule in enumerate(rules, 1):
-                    f.write(f"{i}. {rule['description']}\n")
-                    f.write(f"   → Folder: {rule['folder']}\n")
-                    if rule["conditions"]:
-                        f.write(f"   → Conditions:\n")
-                        for cond in rule["conditions"]:
-                            f.write(f"      - {cond}\n")
-                    f.write("\n")
-            else:
-                f.write("No rules found (empty or custom script)\n\n")
-
-            # Also save full script
-            f.write("Full script:\n")
-            f.write("```sieve\n")
-            f.write(content)
-            f.write("\n```\n\n")
+    _save_parse_cache(cache_path, cache)
 
     print(f"✅ Saved existing filters to: {output_path}")
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -13,12 +13,23 @@ class AnalyzeEmailsRequest:
     folder: str = "INBOX"
     since_date: datetime | None = None
     max_emails: int = 100
-    exclude_folders: list[str] | None = None
+    exclude_folders: tuple[str, ...] = ()
     min_category_size: int = 5
     sample_from_folders: bool = True
+    _exclude_set: frozenset[str] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        if self.max_emails <= 0:
-            raise ValueError("max_emails must be positive")
-        if self.min_category_size <= 0:
-            raise ValueError("min_category_size must be positive")
+        if self.max_emails <= 0 or self.min_category_size <= 0:
+            raise ValueError(
+                "max_emails and min_category_size must be positive "
+                f"(got max_emails={self.max_emails}, "
+                f"min_category_size={self.min_category_size})"
+            )
+        # Accept any iterable (e.g. a list from config) but store it frozen
+        object.__setattr__(self, "exclude_folders", tuple(self.exclude_folders or ()))
+        object.__setattr__(self, "_exclude_set", frozenset(self.exclude_folders))
+
+    @property
+    def exclude_set(self) -> frozenset[str]:
+        """Excluded folders as a set for O(1) membership checks."""
+        return self._exclude_set
@@ -14,8 +14,14 @@ class AnalyzeEmailsResponse:
     sieve_filter: SieveFilter
     total_emails_analyzed: int
     categories_found: int
-    analysis_time_seconds: float
+    analysis_time_ns: int
     filter_output_path: str | None = None
+    duplicate_emails_skipped: int = 0  # Worker calls saved by content dedup
+
+    @property
+    def analysis_time_seconds(self) -> float:
+        """Analysis duration in seconds."""
+        return self.analysis_time_ns / 1e9
 
     @property
     def success(self) -> bool:
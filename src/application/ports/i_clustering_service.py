@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Sequence
+from typing import Iterator, Sequence
 
 import numpy as np
 from numpy.typing import NDArray
@@ -19,7 +19,7 @@ class IClusteringService(ABC):
     def cluster_emails(
         self,
         emails: Sequence[Email],
-        embeddings: NDArray[np.float32],
+        embeddings: NDArray[np.floating],
         min_cluster_size: int = 5,
     ) -> list[EmailCluster]:
         """Cluster emails based on their embedding vectors.
@@ -33,11 +33,35 @@ class IClusteringService(ABC):
             List of EmailCluster objects (excludes noise/outliers)
         """
 
+    def cluster_emails_stream(
+        self,
+        emails: Sequence[Email],
+        embeddings: NDArray[np.floating],
+        min_cluster_size: int = 5,
+    ) -> Iterator[list[EmailCluster]]:
+        """Cluster emails, yielding clusters in batches as they become final.
+
+        Lets callers start labeling early clusters while later clustering
+        passes (e.g. outlier re-clustering) are still running. The default
+        implementation yields everything from cluster_emails() at once.
+
+        Args:
+            emails: Collection of emails to cluster
+            embeddings: 2D array of email embeddings (n_emails, embedding_dim)
+            min_cluster_size: Minimum number of emails to form a cluster
+
+        Yields:
+            Non-empty lists of final EmailCluster objects
+        """
+        clusters = self.cluster_emails(emails, embeddings, min_cluster_size)
+        if clusters:
+            yield clusters
+
     @abstractmethod
     def find_representative_indices(
         self,
         cluster_emails: Sequence[Email],
-        cluster_embeddings: NDArray[np.float32],
+        cluster_embeddings: NDArray[np.floating],
         n_representatives: int = 3,
     ) -> list[int]:
         """Find indices of emails closest to cluster center.
@@ -36,7 +36,7 @@ class IEmailFetcher(ABC):
         folder: str = "INBOX",
         since_date: datetime | None = None,
         max_emails: int | None = None,
-        exclude_folders: list[str] | None = None,
+        exclude_folders: frozenset[str] | None = None,
     ) -> Sequence[Email]:
         """Fetch emails from server.
 
@@ -62,10 +62,25 @@ class IEmailFetcher(ABC):
             List of folder names
         """
 
+    def list_folders_with_counts(self) -> dict[str, int] | None:
+        """List all folders together with their email counts in one request.
+
+        Adapters override this when the server can answer it in a single
+        round trip; the default reports it as unsupported.
+
+        Returns:
+            Dictionary mapping folder names to email counts, or None if the
+            server does not support bulk counts
+        """
+        return None
+
     @abstractmethod
     def get_folder_count(self, folder: str) -> int:
         """Get email count for a folder.
 
+        Must be safe to call concurrently from several threads while
+        connected; callers fan these lookups out across a thread pool.
+
         Args:
             folder: Folder name
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Protocol, Sequence
+from typing import Iterator, Protocol, Sequence
 
 from src.domain.entities.email import Email
 from src.domain.value_objects.email_summary import EmailSummary
@@ -46,3 +46,20 @@ class IEmailSummarizer(Protocol):
             Exception: If batch summarization fails
         """
         ...
+
+    def summarize_stream(
+        self, emails: Sequence[Email], max_inflight: int = 10
+    ) -> Iterator[tuple[Email, EmailSummary]]:
+        """Summarize multiple emails, yielding each summary as it completes.
+
+        Args:
+            emails: Collection of emails to summarize
+            max_inflight: Maximum number of requests in flight at once
+
+        Yields:
+            (email, summary) pairs in completion order
+
+        Raises:
+            Exception: If summarization fails
+        """
+        ...
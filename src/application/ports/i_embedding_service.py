@@ -15,15 +15,22 @@ class IEmbeddingService(ABC):
     """Interface for converting emails to vector embeddings."""
 
     @abstractmethod
-    def encode_emails(self, emails: Sequence[Email]) -> NDArray[np.float32]:
+    def encode_emails(
+        self, emails: Sequence[Email], batch_size: int | None = None
+    ) -> NDArray[np.floating]:
         """Convert emails to vector embeddings.
 
+        Implementations must encode the whole collection in internal
+        micro-batches rather than one email at a time.
+
         Args:
             emails: Collection of emails to encode
+            batch_size: Emails per forward pass (None: implementation default)
 
         Returns:
             2D numpy array of shape (n_emails, embedding_dim)
-            where each row is the embedding vector for an email
+            where each row is the embedding vector for an email; the
+            floating-point dtype is up to the implementation
         """
 
     @abstractmethod
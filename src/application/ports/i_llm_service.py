@@ -9,6 +9,43 @@ from src.domain.entities.email import Email
 from src.domain.value_objects.email_cluster import EmailCluster
 from src.domain.value_objects.email_summary import EmailSummary
 
+# JSON schema of the category structure returned by the analyze_* methods;
+# adapters pass it to providers that support schema-constrained output
+_CATEGORY_PROPERTIES: dict[str, Any] = {
+    "name": {"type": "string"},
+    "description": {"type": "string"},
+    "patterns": {"type": "array", "items": {"type": "string"}},
+    "suggested_folder": {"type": "string"},
+    "confidence": {"type": "number"},
+    "example_subjects": {"type": "array", "items": {"type": "string"}},
+}
+_CATEGORY_REQUIRED = ["name", "patterns", "suggested_folder", "confidence"]
+
+CATEGORY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "categories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    **_CATEGORY_PROPERTIES,
+                    "subcategories": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": _CATEGORY_PROPERTIES,
+                            "required": _CATEGORY_REQUIRED,
+                        },
+                    },
+                },
+                "required": _CATEGORY_REQUIRED,
+            },
+        },
+    },
+    "required": ["categories"],
+}
+
 
 class ILLMService(ABC):
     """Port interface for LLM service adapters.
@@ -33,7 +70,7 @@ class ILLMService(ABC):
             max_sample: Maximum emails to include in analysis
 
         Returns:
-            Dictionary containing:
+            Dictionary matching CATEGORY_SCHEMA:
                 {
                     "categories": [
                         {
@@ -0,0 +1,9 @@
+"""Application services - Helpers shared by use cases."""
+
+from .category_merge import merge_categories
+from .sampler import pack_by_tokens
+
+__all__ = [
+    "merge_categories",
+    "pack_by_tokens",
+]
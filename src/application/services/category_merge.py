@@ -0,0 +1,58 @@
+"""Merging of category analyses produced by separate master-model calls."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def merge_categories(partials: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge category lists from several analyses.
+
+    Categories are matched on their normalized suggested folder (or name);
+    matches keep the highest confidence and the union of their patterns,
+    example subjects and subcategories.
+
+    Args:
+        partials: Parsed results, each with a "categories" list
+
+    Returns:
+        Single result with merged "categories"
+    """
+    return {
+        "categories": merge_category_list(
+            [category for partial in partials for category in partial.get("categories", [])]
+        )
+    }
+
+
+def merge_category_list(categories: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge categories that refer to the same folder, keeping first-seen order.
+
+    Args:
+        categories: Category dictionaries, possibly with duplicates
+
+    Returns:
+        Merged categories
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    for category in categories:
+        key = str(category.get("suggested_folder") or category.get("name", "")).strip().lower()
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(category)
+            continue
+
+        existing["confidence"] = max(
+            existing.get("confidence", 0.0), category.get("confidence", 0.0)
+        )
+        for list_key in ("patterns", "example_subjects"):
+            values = existing.get(list_key, [])
+            extra = [value for value in category.get(list_key, []) if value not in values]
+            if extra:
+                existing[list_key] = values + extra
+        if category.get("subcategories"):
+            existing["subcategories"] = merge_category_list(
+                existing.get("subcategories", []) + category["subcategories"]
+            )
+
+    return list(merged.values())
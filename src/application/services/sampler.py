@@ -0,0 +1,82 @@
+"""Token-budgeted email sampling for master-model prompts."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Sequence
+
+from src.domain.entities.email import Email
+
+# Sample budget for one master-model call; leaves room for the prompt text
+# and the response in a 4k-token context window
+DEFAULT_SAMPLE_TOKENS = 3000
+
+# Rough token estimate without a model-specific tokenizer
+_CHARS_PER_TOKEN = 4
+
+# Master prompts only show the start of each email body
+_BODY_PREVIEW_CHARS = 100
+
+# Per-email prompt overhead (field labels, separators)
+_EMAIL_OVERHEAD_TOKENS = 10
+
+
+def estimate_tokens(email: Email) -> int:
+    """Estimate the prompt tokens an email takes up in a master-model sample.
+
+    Args:
+        email: Email to estimate
+
+    Returns:
+        Approximate token count
+    """
+    chars = (
+        len(email.sender.value)
+        + len(email.subject)
+        + len(email.folder)
+        + min(len(email.body), _BODY_PREVIEW_CHARS)
+    )
+    return chars // _CHARS_PER_TOKEN + _EMAIL_OVERHEAD_TOKENS
+
+
+def pack_by_tokens(
+    emails: Sequence[Email],
+    budget_tokens: int = DEFAULT_SAMPLE_TOKENS,
+    count_tokens: Callable[[Email], int] | None = None,
+) -> list[Email]:
+    """Select a diverse email sample that fits a token budget.
+
+    Emails are bucketed by sender domain and taken round-robin, so a single
+    newsletter cannot fill the whole sample. Within a domain, input order is
+    kept. Emails that do not fit the remaining budget are skipped.
+
+    Args:
+        emails: Emails to sample from
+        budget_tokens: Maximum total tokens of the sample
+        count_tokens: Token counter for one email (default: estimate_tokens)
+
+    Returns:
+        Sampled emails; at least one if any emails were given
+    """
+    count = count_tokens or estimate_tokens
+
+    buckets: dict[str, deque[Email]] = {}
+    for email in emails:
+        buckets.setdefault(email.sender.domain_lower, deque()).append(email)
+
+    queues = deque(buckets.values())
+    sample: list[Email] = []
+    remaining = budget_tokens
+    while queues and remaining > 0:
+        queue = queues.popleft()
+        email = queue.popleft()
+        cost = count(email)
+        if cost <= remaining:
+            sample.append(email)
+            remaining -= cost
+        if queue:
+            queues.append(queue)
+
+    if not sample and emails:
+        sample.append(emails[0])
+    return sample
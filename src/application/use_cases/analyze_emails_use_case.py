@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Sequence
 
 from src.application.dtos.analyze_request import AnalyzeEmailsRequest
 from src.application.dtos.analyze_response import AnalyzeEmailsResponse
@@ -13,11 +18,30 @@ from src.application.ports.i_email_summarizer import IEmailSummarizer
 from src.application.ports.i_embedding_service import IEmbeddingService
 from src.application.ports.i_filter_repository import IFilterRepository
 from src.application.ports.i_llm_service import ILLMService
+from src.application.services.category_merge import merge_categories
+from src.application.services.sampler import pack_by_tokens
+from src.domain.entities.email import Email
 from src.domain.services.filter_generator import FilterGenerator
 from src.domain.services.filter_validator import FilterValidator
+from src.domain.value_objects.email_summary import EmailSummary
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
 logger = logging.getLogger(__name__)
 
+# Concurrent folder-count lookups; each one may use its own IMAP connection,
+# so stay well below typical per-user connection limits
+MAX_FOLDER_COUNT_WORKERS = 4
+
+# Log worker-tier progress every this many summaries
+SUMMARY_PROGRESS_INTERVAL = 50
+
+# Content used to detect duplicate emails before worker summarization
+_NON_WORD_RE = re.compile(r"\W+")
+DEDUP_BODY_CHARS = 2000
+
 
 class AnalyzeEmailsUseCase:
     """Use case for analyzing emails and generating filters.
@@ -53,6 +77,7 @@ class AnalyzeEmailsUseCase:
         max_parallel_workers: int = 3,
         embedding_service: IEmbeddingService | None = None,
         clustering_service: IClusteringService | None = None,
+        embedding_batch_size: int | None = None,
     ) -> None:
         """Initialize use case with dependencies.
 
@@ -62,9 +87,12 @@ class AnalyzeEmailsUseCase:
             filter_repository: Port for saving filters
             filter_generator: Domain service for filter generation
             email_summarizer: Optional worker model for two-tier mode
-            max_parallel_workers: Maximum parallel workers for batch summarization
+            max_parallel_workers: Maximum concurrent model calls (email
+                summarization and cluster labeling)
             embedding_service: Optional embedding service for embedding mode
             clustering_service: Optional clustering service for embedding mode
+            embedding_batch_size: Emails per embedding forward pass
+                (None: embedding service default)
         """
         self.email_fetcher = email_fetcher
         self.llm_service = llm_service
@@ -75,6 +103,7 @@ class AnalyzeEmailsUseCase:
         self.max_parallel_workers = max_parallel_workers
         self.embedding_service = embedding_service
         self.clustering_service = clustering_service
+        self.embedding_batch_size = embedding_batch_size
 
         # Determine analysis mode based on available services
         # Priority: Embedding > Hierarchical > Simple
@@ -99,11 +128,13 @@ class AnalyzeEmailsUseCase:
             ConnectionError: If email server connection fails
             Exception: For other errors during execution
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        analysis_time_ns = None
 
         logger.info(
-            f"Starting email analysis: max_emails={request.max_emails}, "
-            f"exclude_folders={request.exclude_folders}"
+            "Starting email analysis: max_emails=%s, exclude_folders=%s",
+            request.max_emails,
+            request.exclude_folders,
         )
 
         # Step 1: Fetch existing folder structure and filters
@@ -113,7 +144,7 @@ class AnalyzeEmailsUseCase:
         try:
             # Get existing folders and their email counts
             existing_folders = self._fetch_folder_structure()
-            logger.info(f"Found {len(existing_folders)} existing folders")
+            logger.info("Found %d existing folders", len(existing_folders))
 
             # Try to fetch existing Sieve filters (optional)
             existing_filters_summary = self._fetch_existing_filters()
@@ -126,52 +157,40 @@ class AnalyzeEmailsUseCase:
                 folder=request.folder,
                 since_date=request.since_date,
                 max_emails=request.max_emails,
-                exclude_folders=request.exclude_folders,
+                exclude_folders=request.exclude_set,
             )
 
-            logger.info(f"Fetched {len(emails)} emails")
+            logger.info("Fetched %d emails", len(emails))
 
             if not emails:
                 raise ValueError("No emails found to analyze")
 
             # Step 3: Analyze emails using appropriate mode
+            duplicate_emails = 0
             if self.analysis_mode == "embedding":
                 # Embedding-based clustering mode
                 logger.info("Using embedding-based clustering mode")
 
                 # Step 2a: Generate embeddings for all emails
-                logger.info(f"Generating embeddings for {len(emails)} emails...")
-                embeddings = self.embedding_service.encode_emails(emails)
-                logger.info(f"Generated embeddings with shape {embeddings.shape}")
-
-                # Step 2b: Cluster similar emails
-                logger.info("Clustering emails based on embeddings...")
-                clusters = self.clustering_service.cluster_emails(
-                    emails=emails,
-                    embeddings=embeddings,
-                    min_cluster_size=5,
+                logger.info("Generating embeddings for %d emails...", len(emails))
+                embeddings = self.embedding_service.encode_emails(
+                    emails, batch_size=self.embedding_batch_size
                 )
-                logger.info(f"Found {len(clusters)} clusters")
+                logger.info("Generated embeddings with shape %s", embeddings.shape)
 
-                # Step 2c: Analyze clusters with master model
-                logger.info("Labeling clusters with master model...")
-                ai_response = self.llm_service.analyze_clusters(
-                    clusters=clusters,
-                    max_representatives=5,  # Increased for more context per cluster
-                    existing_folders=existing_folders,
-                )
+                # Step 2b/2c: Cluster similar emails and label the clusters
+                # with the master model as they become available
+                logger.info("Clustering emails based on embeddings...")
+                ai_response = self._cluster_and_label(emails, embeddings, existing_folders)
 
             elif self.analysis_mode == "hierarchical":
                 # Two-tier hierarchical mode
                 logger.info("Using hierarchical two-tier analysis mode")
 
                 # Step 2a: Summarize each email with worker model
-                logger.info(f"Summarizing {len(emails)} emails with worker model...")
-                summaries = self.email_summarizer.summarize_batch(
-                    emails=emails,
-                    max_parallel=self.max_parallel_workers,
-                )
-                logger.info(f"Created {len(summaries)} email summaries")
+                logger.info("Summarizing %d emails with worker model...", len(emails))
+                summaries, duplicate_emails = self._summarize_emails(emails)
+                logger.info("Created %d email summaries", len(summaries))
 
                 # Step 2b: Analyze summaries with master model
                 logger.info("Analyzing summaries with master model...")
@@ -185,18 +204,22 @@ class AnalyzeEmailsUseCase:
                 # Simple mode (legacy)
                 logger.info("Using simple analysis mode")
                 logger.info("Analyzing emails with AI...")
+                sample = pack_by_tokens(emails)
+                logger.info("Sampled %d emails within the token budget", len(sample))
                 ai_response = self.llm_service.analyze_emails(
-                    emails=emails,
-                    max_sample=min(20, len(emails)),
+                    emails=sample,
+                    max_sample=len(sample),
                 )
 
-            logger.debug(f"AI response: {ai_response}")
+            # Formatting a large response is costly; skip it unless it is logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("AI response: %s", ai_response)
 
             # Step 3: Generate filter from AI analysis
             logger.info("Generating Sieve filter from patterns...")
             sieve_filter = self.filter_generator.generate_filter_from_raw_response(ai_response)
 
-            logger.info(f"Generated filter with {len(sieve_filter.rules)} rules")
+            logger.info("Generated filter with %d rules", len(sieve_filter.rules))
 
             # Step 3.5: Validate generated filter
             logger.info("Validating generated filter...")
@@ -204,16 +227,16 @@ class AnalyzeEmailsUseCase:
 
             if validation_issues:
                 validation_report = self.filter_validator.format_issues_report(validation_issues)
-                logger.warning(f"Filter validation found issues:\n{validation_report}")
+                logger.warning("Filter validation found issues:\n%s", validation_report)
 
                 # Count errors vs warnings
                 errors = [i for i in validation_issues if i.severity == "error"]
                 warnings = [i for i in validation_issues if i.severity == "warning"]
 
                 if errors:
-                    logger.error(f"Filter has {len(errors)} validation errors!")
+                    logger.error("Filter has %d validation errors!", len(errors))
                 if warnings:
-                    logger.warning(f"Filter has {len(warnings)} validation warnings")
+                    logger.warning("Filter has %d validation warnings", len(warnings))
             else:
                 logger.info("✅ Filter validation passed with no issues")
 
@@ -224,21 +247,136 @@ class AnalyzeEmailsUseCase:
                     sieve_filter,
                     getattr(request, "output_file", "/app/output/generated.sieve"),
                 )
-                logger.info(f"Saved filter to {output_path}")
+                logger.info("Saved filter to %s", output_path)
 
-            analysis_time = time.time() - start_time
+            analysis_time_ns = time.perf_counter_ns() - start_ns
 
             return AnalyzeEmailsResponse(
                 sieve_filter=sieve_filter,
                 total_emails_analyzed=len(emails),
                 categories_found=len(sieve_filter.rules),
-                analysis_time_seconds=analysis_time,
+                analysis_time_ns=analysis_time_ns,
                 filter_output_path=output_path,
+                duplicate_emails_skipped=duplicate_emails,
             )
 
         finally:
             self.email_fetcher.disconnect()
-            logger.info(f"Email analysis completed in {time.time() - start_time:.2f}s")
+            if analysis_time_ns is None:
+                analysis_time_ns = time.perf_counter_ns() - start_ns
+            logger.info("Email analysis completed in %.2fs", analysis_time_ns / 1e9)
+
+    def _summarize_emails(self, emails: Sequence[Email]) -> tuple[list[EmailSummary], int]:
+        """Summarize emails with the worker model.
+
+        Emails with the same normalized subject and body (newsletters,
+        system alerts) are summarized once and the result is copied to
+        each duplicate. Summaries stream in as the worker requests
+        complete, so progress is visible while the batch runs; summarizers
+        without a streaming API fall back to summarize_batch without
+        deduplication.
+
+        Args:
+            emails: Emails to summarize
+
+        Returns:
+            Tuple of (email summaries in completion order, number of worker
+            calls skipped as duplicates)
+        """
+        summarize_stream = getattr(self.email_summarizer, "summarize_stream", None)
+        if summarize_stream is None:
+            summaries = self.email_summarizer.summarize_batch(
+                emails=emails,
+                max_parallel=self.max_parallel_workers,
+            )
+            return summaries, 0
+
+        groups: dict[bytes, list[Email]] = {}
+        for email in emails:
+            groups.setdefault(self._content_hash(email), []).append(email)
+        # Email hashes by identity, so each representative finds its group
+        duplicates_of = {group[0]: group[1:] for group in groups.values()}
+        duplicates = len(emails) - len(duplicates_of)
+        if duplicates:
+            logger.info("Skipping %d duplicate emails (%d unique)", duplicates, len(duplicates_of))
+
+        summaries = []
+        next_progress = SUMMARY_PROGRESS_INTERVAL
+        for email, summary in summarize_stream(
+            list(duplicates_of), max_inflight=self.max_parallel_workers
+        ):
+            summaries.append(summary)
+            for duplicate in duplicates_of[email]:
+                summaries.append(
+                    replace(
+                        summary,
+                        email_id=duplicate.message_id or duplicate.subject[:50],
+                        sender_domain=duplicate.sender.domain,
+                        folder=duplicate.folder,
+                        received_at=duplicate.received_at,
+                    )
+                )
+            if len(summaries) >= next_progress:
+                logger.info("Summarized %d/%d emails", len(summaries), len(emails))
+                next_progress = (
+                    len(summaries) // SUMMARY_PROGRESS_INTERVAL + 1
+                ) * SUMMARY_PROGRESS_INTERVAL
+        return summaries, duplicates
+
+    @staticmethod
+    def _content_hash(email: Email) -> bytes:
+        """Hash an email's normalized subject and body for duplicate detection."""
+        text = f"{email.subject} {email.body[:DEDUP_BODY_CHARS]}"
+        normalized = _NON_WORD_RE.sub(" ", text).lower().strip()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+    def _cluster_and_label(
+        self,
+        emails: Sequence[Email],
+        embeddings: NDArray[np.floating],
+        existing_folders: dict[str, int],
+    ) -> dict[str, Any]:
+        """Cluster emails and label the clusters with the master model.
+
+        Each batch of clusters is sent to the master model as soon as the
+        clustering service yields it, so labeling the main clusters overlaps
+        with re-clustering the outliers. Results are merged by folder.
+
+        Args:
+            emails: Emails to cluster
+            embeddings: Embeddings of the emails, row-aligned
+            existing_folders: Existing folder names to email counts
+
+        Returns:
+            Categories for all clusters
+        """
+        cluster_count = 0
+        # Bounded by the configured limit, like every other Ollama fan-out
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_workers)) as executor:
+            futures = []
+            for batch in self.clustering_service.cluster_emails_stream(
+                emails=emails, embeddings=embeddings, min_cluster_size=5
+            ):
+                cluster_count += len(batch)
+                logger.info("Labeling %d clusters with master model...", len(batch))
+                futures.append(
+                    executor.submit(
+                        self.llm_service.analyze_clusters,
+                        clusters=batch,
+                        max_representatives=5,  # Increased for more context per cluster
+                        existing_folders=existing_folders,
+                    )
+                )
+            partials = [future.result() for future in futures]
+        logger.info("Found %d clusters", cluster_count)
+
+        if not partials:
+            return self.llm_service.analyze_clusters(
+                clusters=[], max_representatives=5, existing_folders=existing_folders
+            )
+        if len(partials) == 1:
+            return partials[0]
+        return merge_categories(partials)
 
     def _fetch_folder_structure(self) -> dict[str, int]:
         """Fetch existing folder structure from email server.
@@ -249,20 +387,35 @@ class AnalyzeEmailsUseCase:
         folder_structure = {}
 
         try:
+            # Servers that can list folders with counts in one round trip
+            # make the per-folder lookups below unnecessary
+            bulk_structure = self.email_fetcher.list_folders_with_counts()
+            if bulk_structure is not None:
+                return bulk_structure
+
             # Get list of all folders
             folders = self.email_fetcher.list_folders()
 
-            # Get email count for each folder
-            for folder in folders:
-                try:
-                    count = self.email_fetcher.get_folder_count(folder)
-                    folder_structure[folder] = count
-                except Exception as e:
-                    logger.warning(f"Failed to get count for folder {folder}: {e}")
-                    folder_structure[folder] = 0
+            if not folders:
+                return folder_structure
+
+            # Get email count for each folder; lookups are round-trip bound,
+            # so run them concurrently and collect in listing order
+            workers = min(MAX_FOLDER_COUNT_WORKERS, len(folders))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    (folder, executor.submit(self.email_fetcher.get_folder_count, folder))
+                    for folder in folders
+                ]
+                for folder, future in futures:
+                    try:
+                        folder_structure[folder] = future.result()
+                    except Exception as e:
+                        logger.warning("Failed to get count for folder %s: %s", folder, e)
+                        folder_structure[folder] = 0
 
         except Exception as e:
-            logger.warning(f"Failed to fetch folder structure: {e}")
+            logger.warning("Failed to fetch folder structure: %s", e)
 
         return folder_structure
 
@@ -303,14 +456,14 @@ class AnalyzeEmailsUseCase:
                     return summary
 
             except Exception as e:
-                logger.debug(f"ManageSieve not available: {e}")
+                logger.debug("ManageSieve not available: %s", e)
                 return None
 
         except ImportError:
             logger.debug("managesieve library not installed, skipping filter fetch")
             return None
         except Exception as e:
-            logger.debug(f"Could not fetch existing filters: {e}")
+            logger.debug("Could not fetch existing filters: %s", e)
             return None
 
         return None
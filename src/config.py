@@ -1,11 +1,45 @@
 """Configuration loader for MailCow AI Filter."""
 
+import copy
+import logging
 import os
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+
+    _LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+    _LIBYAML = False
+
+logger = logging.getLogger(__name__)
+
+# Parsed YAML keyed by (resolved path, mtime_ns); an edited file gets a new key
+_CONFIG_CACHE: dict[tuple[str, int], dict[str, Any]] = {}
+
+# Environment overrides: (env var, config section or None for top level,
+# config key, type cast)
+_ENV_OVERRIDES: tuple[tuple[str, str | None, str, type], ...] = (
+    # IMAP configuration
+    ("MAIL_SERVER", "imap", "server", str),
+    ("MAIL_USERNAME", "imap", "username", str),
+    ("MAIL_PASSWORD", "imap", "password", str),
+    ("PROTOCOL", None, "protocol", str),
+    # AI configuration
+    ("AI_PROVIDER", "ai", "provider", str),
+    ("AI_MODEL", "ai", "model", str),
+    ("OLLAMA_BASE_URL", "ai", "base_url", str),
+    # Analysis configuration
+    ("MAX_EMAILS_TO_ANALYZE", "ai", "max_emails_to_analyze", int),
+    # Logging configuration
+    ("LOG_LEVEL", "logging", "level", str),
+)
+
 
 class Config:
     """Configuration loader from YAML file and environment variables."""
@@ -32,56 +66,35 @@ class Config:
                 "Please create config/config.yml from config/config.example.yml"
             )
 
-        # Load YAML configuration
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self.config: dict[str, Any] = yaml.safe_load(f) or {}
+        # Load YAML configuration, parsing each file version only once
+        key = (str(self.config_path.resolve()), self.config_path.stat().st_mtime_ns)
+        parsed = _CONFIG_CACHE.get(key)
+        if parsed is None:
+            if not _LIBYAML:
+                logger.warning("PyYAML has no libyaml bindings; using the slower Python loader")
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                parsed = yaml.load(f, Loader=SafeLoader) or {}
+            _CONFIG_CACHE[key] = parsed
+
+        # Environment overrides mutate the config, so work on a private copy
+        self.config: dict[str, Any] = copy.deepcopy(parsed)
 
         # Override with environment variables if present
         self._apply_env_overrides()
 
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides to configuration."""
-
-        # IMAP configuration
-        if os.getenv("MAIL_SERVER"):
-            self.config.setdefault("imap", {})
-            self.config["imap"]["server"] = os.getenv("MAIL_SERVER")
-
-        if os.getenv("MAIL_USERNAME"):
-            self.config.setdefault("imap", {})
-            self.config["imap"]["username"] = os.getenv("MAIL_USERNAME")
-
-        if os.getenv("MAIL_PASSWORD"):
-            self.config.setdefault("imap", {})
-            self.config["imap"]["password"] = os.getenv("MAIL_PASSWORD")
-
-        if os.getenv("PROTOCOL"):
-            self.config["protocol"] = os.getenv("PROTOCOL")
-
-        # AI configuration
-        if os.getenv("AI_PROVIDER"):
-            self.config.setdefault("ai", {})
-            self.config["ai"]["provider"] = os.getenv("AI_PROVIDER")
-
-        if os.getenv("AI_MODEL"):
-            self.config.setdefault("ai", {})
-            self.config["ai"]["model"] = os.getenv("AI_MODEL")
-
-        if os.getenv("OLLAMA_BASE_URL"):
-            self.config.setdefault("ai", {})
-            self.config["ai"]["base_url"] = os.getenv("OLLAMA_BASE_URL")
-
-        # Analysis configuration
-        if os.getenv("MAX_EMAILS_TO_ANALYZE"):
-            self.config.setdefault("ai", {})
+        env = os.environ
+        for env_key, section, config_key, cast in _ENV_OVERRIDES:
+            value = env.get(env_key)
+            if not value:
+                continue
             try:
-                self.config["ai"]["max_emails_to_analyze"] = int(
-                    os.getenv("MAX_EMAILS_TO_ANALYZE")
-                )
+                value = cast(value)
             except (ValueError, TypeError):
-                pass
+                continue
 
-        # Logging configuration
-        if os.getenv("LOG_LEVEL"):
-            self.config.setdefault("logging", {})
-            self.config["logging"]["level"] = os.getenv("LOG_LEVEL")
+            if section is None:
+                self.config[config_key] = value
+            else:
+                self.config.setdefault(section, {})[config_key] = value
@@ -1,15 +1,21 @@
 """Email entity - Aggregate root for email messages."""
 
+import itertools
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Self
+from typing import Self, Sequence
 
 from ..value_objects.email_address import EmailAddress
 from ..value_objects.email_pattern import EmailPattern
 
+# Email ids: a random per-process prefix plus a counter, instead of reading
+# the OS random source for every email created
+_ID_PREFIX = uuid.uuid4().hex
+_ID_COUNTER = itertools.count()
 
-@dataclass
+
+@dataclass(slots=True, eq=False)
 class Email:
     """Email aggregate root representing a single email message.
 
@@ -19,7 +25,8 @@ class Email:
 
     id: str
     sender: EmailAddress
-    recipients: tuple[EmailAddress, ...]
+    # Addresses or raw strings; strings are validated by recipient_addresses()
+    recipients: tuple[EmailAddress | str, ...]
     subject: str
     body: str
     headers: dict[str, str]
@@ -27,7 +34,46 @@ class Email:
     folder: str = "INBOX"
     message_id: str | None = None
     has_attachments: bool = False
-    _domain_events: list = field(default_factory=list, init=False, repr=False)
+    # Allocated on first use; most emails never record an event
+    _domain_events: list | None = field(default=None, init=False, repr=False)
+    # (source, lowercased) pairs for the case-insensitive matchers; recomputed
+    # when subject or body has been reassigned since
+    _subject_lower: tuple[str, str] | None = field(default=None, init=False, repr=False)
+    _body_lower: tuple[str, str] | None = field(default=None, init=False, repr=False)
+    # (source, parsed) pair for recipients; most analysis never reads them
+    _recipient_addresses: tuple[Sequence, tuple[EmailAddress, ...]] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    @property
+    def subject_lower(self) -> str:
+        """Lowercased subject, computed once per subject value."""
+        cached = self._subject_lower
+        if cached is None or cached[0] is not self.subject:
+            cached = self._subject_lower = (self.subject, self.subject.lower())
+        return cached[1]
+
+    @property
+    def body_lower(self) -> str:
+        """Lowercased body, computed once per body value."""
+        cached = self._body_lower
+        if cached is None or cached[0] is not self.body:
+            cached = self._body_lower = (self.body, self.body.lower())
+        return cached[1]
+
+    def recipient_addresses(self) -> tuple[EmailAddress, ...]:
+        """Recipients as EmailAddress values, parsed once per recipients value.
+
+        Raises:
+            ValueError: If a recipient address is invalid
+        """
+        cached = self._recipient_addresses
+        if cached is None or cached[0] is not self.recipients:
+            parsed = tuple(
+                r if isinstance(r, EmailAddress) else EmailAddress(r) for r in self.recipients
+            )
+            cached = self._recipient_addresses = (self.recipients, parsed)
+        return cached[1]
 
     @classmethod
     def create(
@@ -59,12 +105,13 @@ class Email:
             New Email entity
 
         Raises:
-            ValueError: If validation fails
+            ValueError: If the sender address is invalid (recipients are
+                validated by recipient_addresses())
         """
         return cls(
-            id=str(uuid.uuid4()),
+            id=f"{_ID_PREFIX}-{next(_ID_COUNTER)}",
             sender=EmailAddress(sender),
-            recipients=tuple(EmailAddress(r) for r in recipients),
+            recipients=tuple(recipients),
             subject=subject,
             body=body,
             headers=headers or {},
@@ -85,14 +132,62 @@ class Email:
         Returns:
             True if email matches pattern
         """
-        if pattern.pattern_type == "domain":
-            return self.sender.matches_domain(pattern.value)
-        elif pattern.pattern_type == "subject":
-            return pattern.value.lower() in self.subject.lower()
-        elif pattern.pattern_type == "sender":
-            return pattern.value.lower() in self.sender.value.lower()
-        else:
-            return False
+        return pattern.predicate()(self)
+
+    def matches_patterns(self, patterns: Sequence[EmailPattern]) -> list[bool]:
+        """Check this email against several patterns.
+
+        Args:
+            patterns: Patterns to match against
+
+        Returns:
+            One flag per pattern, True if the email matches it
+        """
+        return Email.matches_patterns_batch([self], patterns)[0]
+
+    @classmethod
+    def matches_patterns_batch(
+        cls, emails: Sequence["Email"], patterns: Sequence[EmailPattern]
+    ) -> list[list[bool]]:
+        """Match many emails against many patterns at once.
+
+        Evaluated column by column: each pattern's type is resolved once and
+        its value tested against a prebuilt column of lowercased subjects,
+        senders or domains in a single tight loop, instead of branching on
+        the pattern type for every (email, pattern) pair.
+
+        Args:
+            emails: Emails to test
+            patterns: Patterns to match against
+
+        Returns:
+            Matrix of shape (len(emails), len(patterns)); entry [i][j] is True
+            if emails[i] matches patterns[j]
+        """
+        if not patterns:
+            return [[] for _ in emails]
+
+        subjects = [email.subject_lower for email in emails]
+        senders: list[str] | None = None
+        domains: list[str] | None = None
+
+        columns = []
+        for pattern in patterns:
+            value = pattern.value.lower()
+            if pattern.pattern_type == "domain":
+                if domains is None:
+                    domains = [email.sender.domain_lower for email in emails]
+                columns.append([domain == value for domain in domains])
+            elif pattern.pattern_type == "subject":
+                columns.append([value in subject for subject in subjects])
+            elif pattern.pattern_type == "sender":
+                if senders is None:
+                    senders = [email.sender.value_lower for email in emails]
+                columns.append([value in sender for sender in senders])
+            else:
+                columns.append([False] * len(emails))
+
+        return [list(row) for row in zip(*columns)]
 
     def is_from_domain(self, domain: str) -> bool:
         """Check if email is from specified domain."""
@@ -100,16 +195,16 @@ class Email:
 
     def contains_keyword_in_subject(self, keyword: str) -> bool:
         """Check if subject contains keyword (case-insensitive)."""
-        return keyword.lower() in self.subject.lower()
+        return keyword.lower() in self.subject_lower
 
     def contains_keyword_in_body(self, keyword: str) -> bool:
         """Check if body contains keyword (case-insensitive)."""
-        return keyword.lower() in self.body.lower()
+        return keyword.lower() in self.body_lower
 
     def get_domain_events(self) -> list:
         """Get and clear domain events."""
-        events = self._domain_events.copy()
-        self._domain_events.clear()
+        events = self._domain_events or []
+        self._domain_events = None
         return events
 
     def __eq__(self, other: object) -> bool:
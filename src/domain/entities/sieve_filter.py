@@ -1,19 +1,33 @@
 """SieveFilter entity - Aggregate root for Sieve filter rules."""
 
+import io
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Self
+from itertools import chain
+from typing import Iterable, Self
 
 from ..value_objects.filter_rule import FilterRule
 
+# Static script text following the per-filter header comments, ending in
+# the blank line before the first rule
+_HEADER_TAIL = (
+    "#\n"
+    "# IMPORTANT: Review these rules before activating!\n"
+    "\n"
+    'require ["fileinto", "envelope", "imap4flags"];\n'
+    "\n"
+)
+_FOOTER = "# End of AI-generated rules\n# All other mail goes to Inbox (default)"
 
-@dataclass
+
+@dataclass(slots=True, eq=False)
 class SieveFilter:
     """SieveFilter aggregate root representing a complete Sieve filter script.
 
     This is the main entity for filter management with identity (id).
-    Contains filter rules and generates Sieve script syntax.
+    Contains filter rules and generates Sieve script syntax. Equality and
+    hashing are by id only (see __eq__/__hash__).
     """
 
     id: str
@@ -24,7 +38,18 @@ class SieveFilter:
     priority: int = 0
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
-    _domain_events: list = field(default_factory=list, init=False, repr=False)
+    # Allocated on first use; most filters never record an event
+    _domain_events: list | None = field(default=None, init=False, repr=False)
+    # Rules the script body was last rendered for, and the rendered text
+    _rendered_rules: tuple[tuple[FilterRule, ...], str] | None = field(
+        default=None, init=False, repr=False
+    )
+    # hash(self.id), computed once; the id is the identity and never reassigned
+    _hash: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Hash the id once instead of on every set/dict lookup."""
+        self._hash = hash(self.id)
 
     @classmethod
     def create(
@@ -71,7 +96,16 @@ class SieveFilter:
             rule: FilterRule to add
         """
         self.rules.append(rule)
-        self.updated_at = datetime.now()
+        self._touch()
+
+    def add_rules(self, rules: Iterable[FilterRule]) -> None:
+        """Add several rules to the filter as one modification.
+
+        Args:
+            rules: FilterRules to add, in order
+        """
+        self.rules.extend(rules)
+        self._touch()
 
     def remove_rule(self, rule: FilterRule) -> None:
         """Remove a rule from the filter.
@@ -80,17 +114,25 @@ class SieveFilter:
             rule: FilterRule to remove
         """
         self.rules.remove(rule)
-        self.updated_at = datetime.now()
+        self._touch()
 
     def enable(self) -> None:
         """Enable the filter."""
         self.enabled = True
-        self.updated_at = datetime.now()
+        self._touch()
 
     def disable(self) -> None:
         """Disable the filter."""
         self.enabled = False
-        self.updated_at = datetime.now()
+        self._touch()
+
+    def _touch(self, timestamp: datetime | None = None) -> None:
+        """Record a modification.
+
+        Args:
+            timestamp: Modification time (default: now)
+        """
+        self.updated_at = timestamp or datetime.now()
 
     def to_sieve_script(self) -> str:
         """Convert filter to complete Sieve script.
@@ -100,30 +142,29 @@ class SieveFilter:
         Returns:
             Complete Sieve script as string
         """
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
 
         # Header
-        lines.append("# Sieve Filter Rules")
-        lines.append(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"# Filter: {self.name}")
+        write("# Sieve Filter Rules\n")
+        write(f"# Generated: {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+        write(f"# Filter: {self.name}\n")
         if self.description:
-            lines.append(f"# Description: {self.description}")
-        lines.append("#")
-        lines.append("# IMPORTANT: Review these rules before activating!")
-        lines.append("")
-        lines.append('require ["fileinto", "envelope", "imap4flags"];')
-        lines.append("")
-
-        # Rules
-        for rule in self.rules:
-            lines.append(rule.to_sieve())
-            lines.append("")
+            write(f"# Description: {self.description}\n")
+        write(_HEADER_TAIL)
+
+        # Rules, each followed by a blank line; re-rendered only when the
+        # rule list changed (also catches direct edits of self.rules)
+        rules = tuple(self.rules)
+        if self._rendered_rules is None or self._rendered_rules[0] != rules:
+            body = "".join(chain.from_iterable((rule.to_sieve(), "\n\n") for rule in rules))
+            self._rendered_rules = (rules, body)
+        write(self._rendered_rules[1])
 
         # Footer
-        lines.append("# End of AI-generated rules")
-        lines.append("# All other mail goes to Inbox (default)")
+        write(_FOOTER)
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     def validate(self) -> tuple[bool, list[str]]:
         """Validate filter configuration.
@@ -149,10 +190,24 @@ class SieveFilter:
 
         return len(errors) == 0, errors
 
+    def is_valid(self) -> bool:
+        """Check filter configuration, stopping at the first problem.
+
+        Cheaper than validate() when only the verdict is needed.
+
+        Returns:
+            True if validate() would report no errors
+        """
+        return (
+            bool(self.name)
+            and bool(self.rules)
+            and all(rule.conditions and rule.actions for rule in self.rules)
+        )
+
     def get_domain_events(self) -> list:
         """Get and clear domain events."""
-        events = self._domain_events.copy()
-        self._domain_events.clear()
+        events = self._domain_events or []
+        self._domain_events = None
         return events
 
     def __eq__(self, other: object) -> bool:
@@ -163,7 +218,7 @@ class SieveFilter:
 
     def __hash__(self) -> int:
         """Hash based on ID."""
-        return hash(self.id)
+        return self._hash
 
     def __str__(self) -> str:
         return f"SieveFilter(name='{self.name}', rules={len(self.rules)})"
@@ -1,15 +1,24 @@
 """Domain services - Orchestrate complex business logic across entities."""
 
 from .filter_generator import CategoryPattern, FilterGenerator
-from .filter_matcher import FilterMatcher, FilterTestResult, MatchResult
-from .pattern_detector import DetectedPattern, PatternDetector
+from .filter_matcher import (
+    FilterMatcher,
+    FilterTestResult,
+    MatchResult,
+    NeedleSearcher,
+    NeedleSearcherFactory,
+)
+from .pattern_detector import DetectedPattern, EmailIndex, PatternDetector
 
 __all__ = [
     "FilterGenerator",
     "CategoryPattern",
     "PatternDetector",
     "DetectedPattern",
+    "EmailIndex",
     "FilterMatcher",
     "MatchResult",
     "FilterTestResult",
+    "NeedleSearcher",
+    "NeedleSearcherFactory",
 ]
@@ -2,16 +2,85 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Iterator
 
 from ..entities.sieve_filter import SieveFilter
 from ..value_objects.filter_action import FilterAction
 from ..value_objects.filter_condition import FilterCondition
 from ..value_objects.filter_rule import FilterRule
 
+# Category priority tiers (lower number = higher priority), checked in order
+# against the category name and description:
+# 1. Security/Alerts (0-9)
+# 2. Finance/Banking (10-19)
+# 3. Work/Professional (20-29)
+# 4. Shopping/Orders (30-39)
+# 5. Social Media (40-49)
+# 6. Newsletters/Promotions (50-59)
+# 7. Others (60+)
+_PRIORITY_TIERS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (0, ("security", "alert", "warning", "critical", "urgent", "notification")),
+    (10, ("finance", "bank", "payment", "invoice", "receipt", "bill", "paypal", "stripe")),
+    (
+        20,
+        ("work", "github", "gitlab", "ci/cd", "ci-cd", "code", "deploy", "meeting", "slack"),
+    ),
+    (30, ("shop", "order", "shipping", "delivery", "amazon", "ebay", "purchase")),
+    (40, ("social", "facebook", "twitter", "linkedin", "instagram", "message")),
+    (50, ("newsletter", "promotion", "marketing", "ad", "offer", "subscribe")),
+)
+_DEFAULT_PRIORITY = 60
+
+# Flattened (keyword, priority) table in tier order for a single scan
+_PRIORITY_KEYWORDS: tuple[tuple[str, int], ...] = tuple(
+    (keyword, priority) for priority, keywords in _PRIORITY_TIERS for keyword in keywords
+)
+
+# Orders the (sort key, category) pairs from _iter_valid_categories
+_sort_key = itemgetter(0)
+
+
+# Bulk re-imports and subcategories repeat the same name/description pairs
+@lru_cache(maxsize=1024)
+def _compute_priority(name: str, description: str) -> int:
+    """Determine the priority of a category from its name and description.
+
+    Args:
+        name: Category name
+        description: Category description
+
+    Returns:
+        Priority number (lower = higher priority)
+    """
+    # Keywords contain no spaces, so joining cannot create false matches.
+    # str.lower() has an ASCII fast path that beats an ASCII-only
+    # str.translate table, and the `in` scans outrun a combined regex.
+    text = f"{name} {description}".lower()
+    for keyword, priority in _PRIORITY_KEYWORDS:
+        if keyword in text:
+            return priority
+    return _DEFAULT_PRIORITY
+
+
+# AI responses repeat patterns across categories and subcategories; the
+# conditions are immutable, so parsed results can be shared
+@lru_cache(maxsize=4096)
+def _conditions_from_pattern(pattern: str) -> tuple[FilterCondition, ...]:
+    """Parse a pattern string into filter conditions.
+
+    Args:
+        pattern: Pattern like 'from:@domain.com' or 'subject:word1,word2'
+
+    Returns:
+        Conditions for the pattern; empty if the pattern is invalid
+    """
+    return tuple(FilterCondition.try_from_pattern_multi(pattern) or ())
 
-@dataclass
+
+@dataclass(slots=True)
 class CategoryPattern:
     """Raw category pattern from AI analysis.
 
@@ -27,6 +96,12 @@ class CategoryPattern:
     confidence: float
     example_subjects: list[str]
     subcategories: list[CategoryPattern] | None = None
+    # Sort priority, derived once from name and description
+    priority: int = field(init=False, default=_DEFAULT_PRIORITY)
+
+    def __post_init__(self) -> None:
+        """Compute the sort priority once instead of on every sort."""
+        self.priority = _compute_priority(self.name, self.description)
 
 
 class FilterGenerator:
@@ -60,34 +135,21 @@ class FilterGenerator:
         if not categories:
             raise ValueError("No categories provided for filter generation")
 
-        # Filter by confidence threshold
-        valid_categories = [cat for cat in categories if cat.confidence >= self.min_confidence]
+        # Order categories by priority (security > finance > work > social >
+        # promotions), each followed by its own subcategories by priority;
+        # rules end in "stop", so this order decides where mail is filed
+        ordered = sorted(self._iter_valid_categories(categories), key=_sort_key)
 
-        if not valid_categories:
+        if not ordered:
             raise ValueError(
                 f"No categories meet minimum confidence threshold of {self.min_confidence}"
             )
 
-        # Sort categories by priority (security > finance > work > social > promotions)
-        sorted_categories = sorted(valid_categories, key=self._get_category_priority)
-
-        rules = []
-        for category in sorted_categories:
-            # Process category itself if it has patterns
-            rule = self._create_rule_from_category(category)
-            if rule:
-                rules.append(rule)
-
-            # Process subcategories recursively (also sorted by priority)
-            if category.subcategories:
-                sorted_subcats = sorted(
-                    [sc for sc in category.subcategories if sc.confidence >= self.min_confidence],
-                    key=self._get_category_priority,
-                )
-                for subcat in sorted_subcats:
-                    sub_rule = self._create_rule_from_category(subcat)
-                    if sub_rule:
-                        rules.append(sub_rule)
+        rules = [
+            rule
+            for rule in (self._create_rule_from_category(category) for _, category in ordered)
+            if rule is not None
+        ]
 
         if not rules:
             raise ValueError("Failed to generate any valid rules from categories")
@@ -98,108 +160,28 @@ class FilterGenerator:
             rules=rules,
         )
 
-    def _get_category_priority(self, category: CategoryPattern) -> int:
-        """Determine priority of a category (lower number = higher priority).
+    def _iter_valid_categories(
+        self, categories: list[CategoryPattern]
+    ) -> Iterator[tuple[tuple[int, int, int, int], CategoryPattern]]:
+        """Yield categories and subcategories that meet the confidence threshold.
 
-        Priority order:
-        1. Security/Alerts (0-9)
-        2. Finance/Banking (10-19)
-        3. Work/Professional (20-29)
-        4. Shopping/Orders (30-39)
-        5. Social Media (40-49)
-        6. Newsletters/Promotions (50-59)
-        7. Others (60+)
+        Subcategories are only considered under a qualifying parent. Each
+        category comes with a sort key that keeps subcategories directly
+        after their parent, so a single stable sort orders everything.
 
         Args:
-            category: Category to prioritize
+            categories: Top-level categories
 
-        Returns:
-            Priority number (lower = higher priority)
+        Yields:
+            (sort key, category) pairs
         """
-        name_lower = category.name.lower()
-        desc_lower = category.description.lower()
-        combined = f"{name_lower} {desc_lower}"
-
-        # Security/Alerts - highest priority
-        security_keywords = [
-            "security",
-            "alert",
-            "warning",
-            "critical",
-            "urgent",
-            "notification",
-        ]
-        if any(kw in combined for kw in security_keywords):
-            return 0
-
-        # Finance/Banking
-        finance_keywords = [
-            "finance",
-            "bank",
-            "payment",
-            "invoice",
-            "receipt",
-            "bill",
-            "paypal",
-            "stripe",
-        ]
-        if any(kw in combined for kw in finance_keywords):
-            return 10
-
-        # Work/Professional
-        work_keywords = [
-            "work",
-            "github",
-            "gitlab",
-            "ci/cd",
-            "ci-cd",
-            "code",
-            "deploy",
-            "meeting",
-            "slack",
-        ]
-        if any(kw in combined for kw in work_keywords):
-            return 20
-
-        # Shopping/Orders
-        shopping_keywords = [
-            "shop",
-            "order",
-            "shipping",
-            "delivery",
-            "amazon",
-            "ebay",
-            "purchase",
-        ]
-        if any(kw in combined for kw in shopping_keywords):
-            return 30
-
-        # Social Media
-        social_keywords = [
-            "social",
-            "facebook",
-            "twitter",
-            "linkedin",
-            "instagram",
-            "message",
-        ]
-        if any(kw in combined for kw in social_keywords):
-            return 40
-
-        # Newsletters/Promotions
-        promo_keywords = [
-            "newsletter",
-            "promotion",
-            "marketing",
-            "ad",
-            "offer",
-            "subscribe",
-        ]
-        if any(kw in combined for kw in promo_keywords):
-            return 50
-
-        # Others (lowest priority)
-        return 60
+        for index, category in enumerate(categories):
+            if category.confidence < self.min_confidence:
+                continue
+            yield (category.priority, index, 0, 0), category
+            for subcategory in category.subcategories or ():
+                if subcategory.confidence >= self.min_confidence:
+                    yield (category.priority, index, 1, subcategory.priority), subcategory
 
     def _create_rule_from_category(self, category: CategoryPattern) -> FilterRule | None:
         """Create a single filter rule from a category pattern.
@@ -213,17 +195,11 @@ class FilterGenerator:
         if not category.patterns:
             return None
 
-        # Convert pattern strings to FilterCondition objects
-        # Use from_pattern_multi() to properly handle comma-separated keywords
+        # Convert pattern strings to FilterCondition objects (comma-separated
+        # keywords become several conditions, invalid patterns none)
         conditions = []
         for pattern in category.patterns:
-            try:
-                # from_pattern_multi() returns a list (may be single or multiple conditions)
-                pattern_conditions = FilterCondition.from_pattern_multi(pattern)
-                conditions.extend(pattern_conditions)
-            except ValueError:
-                # Skip invalid patterns
-                continue
+            conditions.extend(_conditions_from_pattern(pattern))
 
         if not conditions:
             return None
@@ -234,16 +210,14 @@ class FilterGenerator:
             FilterAction.stop(),
         ]
 
-        # Use 'anyof' (OR) logic when multiple conditions are present
-        # This ensures "subject:order,bestellt" becomes (order OR bestellt)
-        logical_operator = "anyof" if len(conditions) > 1 else "anyof"
-
+        # Always use 'anyof' (OR) logic; with multiple conditions this makes
+        # "subject:order,bestellt" match (order OR bestellt)
         return FilterRule.create(
             name=category.name,
             description=category.description,
             conditions=conditions,
             actions=actions,
-            logical_operator=logical_operator,
+            logical_operator="anyof",
         )
 
     def generate_filter_from_raw_response(self, ai_response: dict[str, Any]) -> SieveFilter:
@@ -274,7 +248,10 @@ class FilterGenerator:
         return self.generate_filter_from_categories(categories)
 
     def _parse_category(self, cat_dict: dict[str, Any]) -> CategoryPattern | None:
-        """Parse a category dictionary (with optional subcategories) recursively.
+        """Parse a category dictionary (with optional subcategories).
+
+        Walks the hierarchy with an explicit work list instead of recursion,
+        so deeply nested AI output cannot exhaust the call stack.
 
         Args:
             cat_dict: Dictionary containing category data
@@ -282,22 +259,54 @@ class FilterGenerator:
         Returns:
             CategoryPattern with subcategories or None if invalid
         """
-        # Parse subcategories if present
-        subcategories = None
-        if "subcategories" in cat_dict and cat_dict["subcategories"]:
-            subcategories = []
-            for subcat_dict in cat_dict["subcategories"]:
-                subcat = self._parse_category(subcat_dict)
-                if subcat:
-                    subcategories.append(subcat)
+        # Breadth-first: every node is listed after its parent
+        nodes = [cat_dict]
+        parents = [-1]
+        for index, node in enumerate(nodes):
+            if "subcategories" in node and node["subcategories"]:
+                for subcat_dict in node["subcategories"]:
+                    nodes.append(subcat_dict)
+                    parents.append(index)
+
+        # Build in reverse, so children exist before their parent; each
+        # child list is collected back to front
+        children: list[list[CategoryPattern] | None] = [None] * len(nodes)
+        category = None
+        for index in range(len(nodes) - 1, -1, -1):
+            subcategories = children[index]
+            if subcategories:
+                subcategories.reverse()
+            category = self._build_category(nodes[index], subcategories)
+            parent = parents[index]
+            if parent >= 0:
+                if children[parent] is None:
+                    children[parent] = []
+                children[parent].append(category)
+
+        return category
+
+    @staticmethod
+    def _build_category(
+        cat_dict: dict[str, Any], subcategories: list[CategoryPattern] | None
+    ) -> CategoryPattern:
+        """Create a CategoryPattern from one category dictionary.
+
+        Args:
+            cat_dict: Dictionary containing category data
+            subcategories: Already parsed subcategories
 
+        Returns:
+            CategoryPattern for the dictionary
+        """
+        get = cat_dict.get
+        name = get("name", "Unknown")
         return CategoryPattern(
-            name=cat_dict.get("name", "Unknown"),
-            description=cat_dict.get("description", ""),
-            patterns=cat_dict.get("patterns", []),
-            suggested_folder=cat_dict.get("suggested_folder", cat_dict.get("name", "Unknown")),
-            confidence=cat_dict.get("confidence", 0.5),
-            example_subjects=cat_dict.get("example_subjects", []),
+            name=name,
+            description=get("description", ""),
+            patterns=get("patterns", []),
+            suggested_folder=get("suggested_folder", name),
+            confidence=get("confidence", 0.5),
+            example_subjects=get("example_subjects", []),
             subcategories=subcategories if subcategories else None,
         )
 
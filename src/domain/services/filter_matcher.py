@@ -2,14 +2,292 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Sequence
+import io
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Callable, Collection, Iterable, Sequence
 
 from ..entities.email import Email
 from ..entities.sieve_filter import SieveFilter
-from ..value_objects.filter_action import FilterAction
+from ..value_objects.filter_action import ActionType, FilterAction
+from ..value_objects.filter_condition import MatchType
 from ..value_objects.filter_rule import FilterRule
 
+# A condition prepared for matching: (field name, match type, value), with the
+# value lowercased; for MATCHES it is the compiled lowercase wildcard pattern
+_PreparedCondition = tuple[str, MatchType, "str | re.Pattern[str]"]
+
+# Smallest batch worth spreading over an injected executor; below it,
+# shipping the rules and email fields to workers costs more than matching
+PARALLEL_MIN_EMAILS = 2000
+
+# Emails per task handed to the executor
+PARALLEL_CHUNK_EMAILS = 1000
+
+# Separator lines in the test report
+_RULE = "=" * 60 + "\n"
+_THIN_RULE = "-" * 60 + "\n"
+
+
+class NeedleSearcher(ABC):
+    """Strategy that finds which of a fixed set of substrings occur in a text.
+
+    FilterMatcher builds one searcher per field over the CONTAINS values of
+    that field, so a single scan settles every CONTAINS condition on it.
+    Implementations (e.g. an Aho-Corasick automaton) live in infrastructure.
+    """
+
+    @abstractmethod
+    def find(self, text: str) -> Iterable[str]:
+        """Find the needles occurring in text.
+
+        Args:
+            text: Lowercased field value to scan
+
+        Returns:
+            Needles found in text; may repeat a needle
+        """
+
+
+# Builds a NeedleSearcher over a collection of lowercased needles
+NeedleSearcherFactory = Callable[[Collection[str]], NeedleSearcher]
+
+
+@lru_cache(maxsize=1024)
+def _compile_wildcard(value: str) -> re.Pattern[str]:
+    """Compile a Sieve :matches wildcard (* and ?) into a regex.
+
+    Everything except the wildcards is matched literally. Callers pass a
+    lowercased value and match it against lowercased text, so the regex
+    engine does no per-character case folding.
+    """
+    pattern = re.escape(value).replace(r"\*", ".*").replace(r"\?", ".")
+    return re.compile(pattern)
+
+
+@dataclass(frozen=True, slots=True)
+class _PreparedRule:
+    """A filter rule with its conditions prepared once per filter run."""
+
+    rule: FilterRule
+    match_all: bool
+    stops: bool
+    conditions: tuple[_PreparedCondition, ...]
+    # The CONTAINS conditions as (field, needle) pairs, and all the others,
+    # for deciding a rule from the needle search results of an email
+    contains_pairs: frozenset[tuple[str, str]]
+    other_conditions: tuple[_PreparedCondition, ...]
+
+    @classmethod
+    def from_rule(cls, rule: FilterRule, always_stop: bool = False) -> _PreparedRule:
+        """Factory method to prepare a rule for matching.
+
+        Args:
+            rule: Rule to prepare
+            always_stop: Treat the rule as ending in a stop action
+        """
+        conditions = tuple(
+            (
+                cond.field.lower(),
+                cond.match_type,
+                _compile_wildcard(cond.value_lower)
+                if cond.match_type is MatchType.MATCHES
+                else cond.value_lower,
+            )
+            for cond in rule.conditions
+        )
+        return cls(
+            rule=rule,
+            match_all=rule.matches_all_conditions(),
+            stops=always_stop
+            or any(action.action_type is ActionType.STOP for action in rule.actions),
+            conditions=conditions,
+            contains_pairs=frozenset(
+                (field_name, value)
+                for field_name, match_type, value in conditions
+                if match_type is MatchType.CONTAINS
+            ),
+            other_conditions=tuple(
+                cond for cond in conditions if cond[1] is not MatchType.CONTAINS
+            ),
+        )
+
+
+def _build_searchers(
+    prepared_rules: Sequence[_PreparedRule],
+    searcher_factory: NeedleSearcherFactory | None,
+) -> dict[str, NeedleSearcher] | None:
+    """Build one needle searcher per field over all CONTAINS needles.
+
+    Args:
+        prepared_rules: Prepared rules of the filter
+        searcher_factory: Factory for the searchers, if one was injected
+
+    Returns:
+        Searcher by field name, or None without a factory or CONTAINS
+        conditions (each condition is then tested with a substring test)
+    """
+    if searcher_factory is None:
+        return None
+
+    needles: dict[str, set[str]] = {}
+    for prepared in prepared_rules:
+        for field_name, value in prepared.contains_pairs:
+            needles.setdefault(field_name, set()).add(value)
+
+    return {
+        field_name: searcher_factory(values) for field_name, values in needles.items()
+    } or None
+
+
+def _find_needles(
+    searchers: dict[str, NeedleSearcher] | None, fields: dict[str, str]
+) -> set[tuple[str, str]] | None:
+    """Scan each field once for all CONTAINS needles.
+
+    Args:
+        searchers: Searchers from _build_searchers()
+        fields: Lowercased email fields from FilterMatcher._lowered_fields()
+
+    Returns:
+        Matched (field, needle) pairs, or None to test needles one by one
+    """
+    if searchers is None:
+        return None
+    found: set[tuple[str, str]] = set()
+    for field_name, searcher in searchers.items():
+        text = fields.get(field_name)
+        if text:
+            found.update((field_name, needle) for needle in searcher.find(text))
+    return found
+
+
+def _condition_matches(
+    condition: _PreparedCondition,
+    fields: dict[str, str],
+    found: set[tuple[str, str]] | None,
+) -> bool:
+    """Test if a single condition matches an email.
+
+    Args:
+        condition: Prepared filter condition to test
+        fields: Lowercased email fields from FilterMatcher._lowered_fields()
+        found: CONTAINS matches from _find_needles(), if available
+
+    Returns:
+        True if condition matches
+    """
+    field_name, match_type, value = condition
+    field_value = fields.get(field_name)
+
+    if field_value is None:
+        return False
+
+    # Handle different match types; both sides are already lowercased
+    if match_type is MatchType.IS:
+        return field_value == value
+
+    elif match_type is MatchType.CONTAINS:
+        if found is not None:
+            return (field_name, value) in found
+        return value in field_value
+
+    elif match_type is MatchType.MATCHES:
+        # Wildcard matching (* and ?), compiled once per pattern
+        return value.match(field_value) is not None
+
+    return False
+
+
+def _rule_matches(
+    prepared: _PreparedRule,
+    fields: dict[str, str],
+    found: set[tuple[str, str]] | None,
+) -> bool:
+    """Test if a single rule matches an email.
+
+    Args:
+        prepared: Prepared filter rule to test
+        fields: Lowercased email fields from FilterMatcher._lowered_fields()
+        found: CONTAINS matches from _find_needles(), if available
+
+    Returns:
+        True if email matches rule conditions
+    """
+    if not prepared.conditions:
+        return False
+
+    if found is not None:
+        # The needle search already found this email's CONTAINS matches:
+        # settle all of the rule's CONTAINS conditions with one set operation
+        # and only test the remaining conditions one by one
+        others = prepared.other_conditions
+        if prepared.match_all:
+            return prepared.contains_pairs <= found and all(
+                _condition_matches(cond, fields, found) for cond in others
+            )
+        return not found.isdisjoint(prepared.contains_pairs) or any(
+            _condition_matches(cond, fields, found) for cond in others
+        )
+
+    # Check all conditions based on the rule's logical operator
+    if prepared.match_all:
+        # ALL conditions must match (AND logic)
+        return all(_condition_matches(cond, fields, found) for cond in prepared.conditions)
+    else:
+        # ANY condition can match (OR logic)
+        return any(_condition_matches(cond, fields, found) for cond in prepared.conditions)
+
+
+def _match_emails(
+    prepared_rules: Sequence[_PreparedRule],
+    searchers: dict[str, NeedleSearcher] | None,
+    emails_fields: Sequence[dict[str, str]],
+) -> list[list[int]]:
+    """Match emails against prepared rules in filter order.
+
+    Args:
+        prepared_rules: Prepared rules of the filter
+        searchers: Searchers from _build_searchers()
+        emails_fields: Lowercased fields of each email
+
+    Returns:
+        Per email, the indices of the matching rules, up to and including
+        the first matching rule with a stop action
+    """
+    matches = []
+    for fields in emails_fields:
+        found = _find_needles(searchers, fields)
+        matched = []
+        for index, prepared in enumerate(prepared_rules):
+            if _rule_matches(prepared, fields, found):
+                matched.append(index)
+                # Stop processing if rule has stop action
+                if prepared.stops:
+                    break
+        matches.append(matched)
+    return matches
+
+
+def _match_chunk(
+    prepared_rules: Sequence[_PreparedRule],
+    searcher_factory: NeedleSearcherFactory | None,
+    emails_fields: Sequence[dict[str, str]],
+) -> list[list[int]]:
+    """Match one chunk of emails, building the needle searchers first.
+
+    Module-level with picklable arguments so a process pool can run it;
+    each task rebuilds the searchers instead of receiving them.
+
+    Returns:
+        Per email, the matching rule indices as returned by _match_emails()
+    """
+    searchers = _build_searchers(prepared_rules, searcher_factory)
+    return _match_emails(prepared_rules, searchers, emails_fields)
+
 
 @dataclass
 class MatchResult:
@@ -31,6 +309,8 @@ class FilterTestResult:
     match_rate: float
     matches_by_rule: dict[str, int]
     match_results: list[MatchResult]
+    # Emails no rule matched, collected in the same pass
+    unmatched_emails: list[Email] = field(default_factory=list)
 
 
 class FilterMatcher:
@@ -42,12 +322,39 @@ class FilterMatcher:
     - Generate test reports
     """
 
-    def test_filter(self, sieve_filter: SieveFilter, emails: Sequence[Email]) -> FilterTestResult:
+    def __init__(
+        self,
+        needle_searcher_factory: NeedleSearcherFactory | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize filter matcher.
+
+        Args:
+            needle_searcher_factory: Optional factory for multi-needle
+                searchers, used to find all CONTAINS matches of a field in
+                one scan; without it each condition is a substring test
+            executor: Optional executor (e.g. a process pool) that matches
+                batches of at least PARALLEL_MIN_EMAILS emails in chunks;
+                without it matching runs in the calling thread
+        """
+        self.needle_searcher_factory = needle_searcher_factory
+        self.executor = executor
+
+    def test_filter(
+        self,
+        sieve_filter: SieveFilter,
+        emails: Sequence[Email],
+        first_match_only: bool = False,
+    ) -> FilterTestResult:
         """Test a complete filter against email collection.
 
         Args:
             sieve_filter: The filter to test
             emails: Collection of emails to test against
+            first_match_only: Stop at each email's first matching rule, as if
+                every rule ended in "stop". Sieve itself keeps evaluating
+                rules after a match without "stop", so this under-reports
+                overlapping rules; use it when only the destination matters.
 
         Returns:
             Complete test result with statistics
@@ -63,28 +370,41 @@ class FilterMatcher:
             )
 
         match_results = []
+        unmatched_emails = []
         matches_by_rule: dict[str, int] = {rule.name: 0 for rule in sieve_filter.rules}
 
-        for email in emails:
-            for rule in sieve_filter.rules:
-                if not rule.enabled:
-                    continue
-
-                matched = self._test_rule_against_email(rule, email)
-
-                if matched:
-                    matches_by_rule[rule.name] += 1
-                    match_results.append(
-                        MatchResult(
-                            email=email,
-                            rule=rule,
-                            matched=True,
-                            actions=rule.actions,
-                        )
+        # Prepare conditions once per filter instead of once per email
+        prepared_rules = [
+            _PreparedRule.from_rule(rule, always_stop=first_match_only)
+            for rule in sieve_filter.rules
+        ]
+        emails_fields = [self._lowered_fields(email) for email in emails]
+
+        if self.executor is not None and len(emails_fields) >= PARALLEL_MIN_EMAILS:
+            match_chunk = partial(_match_chunk, prepared_rules, self.needle_searcher_factory)
+            chunks = [
+                emails_fields[i : i + PARALLEL_CHUNK_EMAILS]
+                for i in range(0, len(emails_fields), PARALLEL_CHUNK_EMAILS)
+            ]
+            matches = [m for chunk in self.executor.map(match_chunk, chunks) for m in chunk]
+        else:
+            matches = _match_chunk(prepared_rules, self.needle_searcher_factory, emails_fields)
+
+        for email, matched in zip(emails, matches):
+            if not matched:
+                unmatched_emails.append(email)
+                continue
+            for index in matched:
+                rule = prepared_rules[index].rule
+                matches_by_rule[rule.name] += 1
+                match_results.append(
+                    MatchResult(
+                        email=email,
+                        rule=rule,
+                        matched=True,
+                        actions=rule.actions,
                     )
-                    # Stop processing if rule has stop action
-                    if any(action.action_type == "stop" for action in rule.actions):
-                        break
+                )
 
         matched_emails = len(match_results)
         match_rate = matched_emails / len(emails) if emails else 0.0
@@ -96,93 +416,37 @@ class FilterMatcher:
             match_rate=match_rate,
             matches_by_rule=matches_by_rule,
             match_results=match_results,
+            unmatched_emails=unmatched_emails,
         )
 
-    def _test_rule_against_email(self, rule: FilterRule, email: Email) -> bool:
-        """Test if a single rule matches an email.
-
-        Args:
-            rule: Filter rule to test
-            email: Email to test against
-
-        Returns:
-            True if email matches rule conditions
-        """
-        if not rule.conditions:
-            return False
-
-        # Check all conditions based on match_all setting
-        if rule.match_all:
-            # ALL conditions must match (AND logic)
-            return all(self._test_condition(cond, email) for cond in rule.conditions)
-        else:
-            # ANY condition can match (OR logic)
-            return any(self._test_condition(cond, email) for cond in rule.conditions)
-
-    def _test_condition(self, condition, email: Email) -> bool:
-        """Test if a single condition matches an email.
-
-        Args:
-            condition: Filter condition to test
-            email: Email to test against
-
-        Returns:
-            True if condition matches
-        """
-        # Import here to avoid circular dependency
-        from ..value_objects.filter_condition import MatchType
-
-        field_value = self._get_email_field_value(email, condition.field)
-
-        if field_value is None:
-            return False
-
-        # Handle different match types
-        if condition.match_type == MatchType.IS:
-            return field_value.lower() == condition.value.lower()
-
-        elif condition.match_type == MatchType.CONTAINS:
-            return condition.value.lower() in field_value.lower()
-
-        elif condition.match_type == MatchType.MATCHES:
-            # Simple wildcard matching (* and ?)
-            import re
-
-            pattern = condition.value.replace("*", ".*").replace("?", ".")
-            return bool(re.match(pattern, field_value, re.IGNORECASE))
-
-        return False
-
-    def _get_email_field_value(self, email: Email, field: str) -> str | None:
-        """Extract field value from email.
+    @staticmethod
+    def _lowered_fields(email: Email) -> dict[str, str]:
+        """Lowercase the matchable email fields once per email.
 
         Args:
             email: Email entity
-            field: Field name (from, to, subject, etc.)
 
         Returns:
-            Field value or None if field doesn't exist
+            Lowercased value by field name (from, to, subject, body); fields
+            not in the mapping don't exist
         """
-        field_lower = field.lower()
-
-        if field_lower == "from":
-            return email.sender.value
-        elif field_lower == "subject":
-            return email.subject
-        elif field_lower == "to":
-            # For simplicity, just return empty string
+        return {
+            "from": email.sender.value_lower,
+            "subject": email.subject_lower,
+            # For simplicity, just use an empty string
             # In full implementation, would need to store recipients
-            return ""
-        elif field_lower == "body":
-            return email.body or ""
-
-        return None
+            "to": "",
+            "body": email.body_lower,
+        }
 
     def find_unmatched_emails(
         self, sieve_filter: SieveFilter, emails: Sequence[Email]
     ) -> list[Email]:
         """Find emails that don't match any filter rules.
 
+        Callers that also need the match statistics should read
+        FilterTestResult.unmatched_emails instead of running a second pass.
+
         Args:
             sieve_filter: Filter to test
             emails: Email collection
@@ -190,22 +454,8 @@ class FilterMatcher:
         Returns:
             List of emails that don't match any rule
         """
-        unmatched = []
-
-        for email in emails:
-            matched_any = False
-            for rule in sieve_filter.rules:
-                if not rule.enabled:
-                    continue
-
-                if self._test_rule_against_email(rule, email):
-                    matched_any = True
-                    break
-
-            if not matched_any:
-                unmatched.append(email)
-
-        return unmatched
+        # Whether an email matched is settled by its first matching rule
+        return self.test_filter(sieve_filter, emails, first_match_only=True).unmatched_emails
 
     def simulate_actions(self, match_result: MatchResult) -> dict[str, str | bool]:
         """Simulate what would happen when filter actions are applied.
@@ -242,27 +492,27 @@ class FilterMatcher:
         Returns:
             Formatted report string
         """
-        lines = []
-        lines.append("=" * 60)
-        lines.append("FILTER TEST REPORT")
-        lines.append("=" * 60)
-        lines.append(f"Filter: {test_result.filter.name}")
-        lines.append(f"Total Emails: {test_result.total_emails}")
-        lines.append(f"Matched Emails: {test_result.matched_emails}")
-        lines.append(f"Match Rate: {test_result.match_rate:.1%}")
-        lines.append("")
-
-        lines.append("Matches by Rule:")
-        lines.append("-" * 60)
+        buf = io.StringIO()
+        write = buf.write
+
+        write(_RULE)
+        write("FILTER TEST REPORT\n")
+        write(_RULE)
+        write(f"Filter: {test_result.filter.name}\n")
+        write(f"Total Emails: {test_result.total_emails}\n")
+        write(f"Matched Emails: {test_result.matched_emails}\n")
+        write(f"Match Rate: {test_result.match_rate:.1%}\n\n")
+
+        write("Matches by Rule:\n")
+        write(_THIN_RULE)
         for rule_name, count in test_result.matches_by_rule.items():
-            lines.append(f"  {rule_name}: {count} emails")
+            write(f"  {rule_name}: {count} emails\n")
 
         if test_result.match_results:
-            lines.append("")
-            lines.append("Sample Matches:")
-            lines.append("-" * 60)
+            write("\nSample Matches:\n")
+            write(_THIN_RULE)
             for i, match in enumerate(test_result.match_results[:5], 1):
-                lines.append(f"  {i}. [{match.rule.name}] {match.email.subject[:50]}")
+                write(f"  {i}. [{match.rule.name}] {match.email.subject[:50]}\n")
 
-        lines.append("=" * 60)
-        return "\n".join(lines)
+        write("=" * 60)
+        return buf.getvalue()
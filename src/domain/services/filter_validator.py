@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 
 from ..entities.sieve_filter import SieveFilter
+from ..value_objects.filter_action import ActionType
 from ..value_objects.filter_condition import (
     GENERIC_DOMAINS,
     INVALID_DOMAINS,
+    ConditionType,
 )
 from ..value_objects.filter_rule import FilterRule
 
+# Separator line in the validation report
+_RULE = "=" * 60 + "\n"
+
 
 @dataclass
 class ValidationIssue:
@@ -117,8 +123,8 @@ class FilterValidator:
         issues = []
 
         for condition in rule.conditions:
-            if condition.condition_type.value == "address_domain":
-                domain = condition.value.lower()
+            if condition.condition_type is ConditionType.ADDRESS_DOMAIN:
+                domain = condition.value_lower
                 if domain in INVALID_DOMAINS:
                     issues.append(
                         ValidationIssue(
@@ -143,8 +149,8 @@ class FilterValidator:
         issues = []
 
         for condition in rule.conditions:
-            if condition.condition_type.value == "address_domain":
-                domain = condition.value.lower()
+            if condition.condition_type is ConditionType.ADDRESS_DOMAIN:
+                domain = condition.value_lower
                 if domain in GENERIC_DOMAINS:
                     issues.append(
                         ValidationIssue(
@@ -195,39 +201,28 @@ class FilterValidator:
         """
         issues = []
 
-        # Group rules by target folders
-        folder_conditions: dict[str, list[tuple[FilterRule, set[str]]]] = {}
+        # Folders each sender domain is filed into, in rule order; dict keys
+        # serve as an ordered set so the report lists folders deterministically
+        domain_to_folders: dict[str, dict[str, None]] = {}
 
         for rule in rules:
             # Extract target folder from fileinto action
-            target_folder = None
-            for action in rule.actions:
-                if hasattr(action, "folder"):
-                    target_folder = action.folder
-                    break
+            target_folder = next(
+                (
+                    action.parameter
+                    for action in rule.actions
+                    if action.action_type is ActionType.FILEINTO
+                ),
+                None,
+            )
 
             if not target_folder:
                 continue
 
-            # Extract domains from conditions
-            domains = set()
+            # Record the folder for each domain condition
             for condition in rule.conditions:
-                if condition.condition_type.value == "address_domain":
-                    domains.add(condition.value.lower())
-
-            if target_folder not in folder_conditions:
-                folder_conditions[target_folder] = []
-            folder_conditions[target_folder].append((rule, domains))
-
-        # Check for same domain in multiple folders
-        domain_to_folders: dict[str, list[str]] = {}
-        for folder, rule_domains_list in folder_conditions.items():
-            for rule, domains in rule_domains_list:
-                for domain in domains:
-                    if domain not in domain_to_folders:
-                        domain_to_folders[domain] = []
-                    if folder not in domain_to_folders[domain]:
-                        domain_to_folders[domain].append(folder)
+                if condition.condition_type is ConditionType.ADDRESS_DOMAIN:
+                    domain_to_folders.setdefault(condition.value_lower, {})[target_folder] = None
 
         # Report domains used in multiple folders
         for domain, folders in domain_to_folders.items():
@@ -260,41 +255,30 @@ class FilterValidator:
         warnings = [i for i in issues if i.severity == "warning"]
         infos = [i for i in issues if i.severity == "info"]
 
-        report = []
-        report.append("=" * 60)
-        report.append("SIEVE FILTER VALIDATION REPORT")
-        report.append("=" * 60)
-        report.append("")
-
-        if errors:
-            report.append(f"❌ ERRORS ({len(errors)}):")
-            report.append("")
-            for i, issue in enumerate(errors, 1):
-                report.append(f"{i}. [{issue.rule_name}] {issue.message}")
-                if issue.suggestion:
-                    report.append(f"   💡 {issue.suggestion}")
-                report.append("")
-
-        if warnings:
-            report.append(f"⚠️  WARNINGS ({len(warnings)}):")
-            report.append("")
-            for i, issue in enumerate(warnings, 1):
-                report.append(f"{i}. [{issue.rule_name}] {issue.message}")
-                if issue.suggestion:
-                    report.append(f"   💡 {issue.suggestion}")
-                report.append("")
-
-        if infos:
-            report.append(f"ℹ️  INFO ({len(infos)}):")
-            report.append("")
-            for i, issue in enumerate(infos, 1):
-                report.append(f"{i}. [{issue.rule_name}] {issue.message}")
+        buf = io.StringIO()
+        write = buf.write
+
+        write(_RULE)
+        write("SIEVE FILTER VALIDATION REPORT\n")
+        write(_RULE)
+        write("\n")
+
+        for heading, group in (
+            ("❌ ERRORS", errors),
+            ("⚠️  WARNINGS", warnings),
+            ("ℹ️  INFO", infos),
+        ):
+            if not group:
+                continue
+            write(f"{heading} ({len(group)}):\n\n")
+            for i, issue in enumerate(group, 1):
+                write(f"{i}. [{issue.rule_name}] {issue.message}\n")
                 if issue.suggestion:
-                    report.append(f"   💡 {issue.suggestion}")
-                report.append("")
+                    write(f"   💡 {issue.suggestion}\n")
+                write("\n")
 
-        report.append("=" * 60)
-        report.append(f"Total: {len(errors)} errors, {len(warnings)} warnings, {len(infos)} info")
-        report.append("=" * 60)
+        write(_RULE)
+        write(f"Total: {len(errors)} errors, {len(warnings)} warnings, {len(infos)} info\n")
+        write("=" * 60)
 
-        return "\n".join(report)
+        return buf.getvalue()
@@ -2,12 +2,45 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass
 from typing import Sequence
 
 from ..entities.email import Email
 
+# Common subject words to ignore
+STOP_WORDS = frozenset(
+    {
+        "re",
+        "fwd",
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "from",
+        "up",
+        "out",
+        "if",
+        "about",
+        "as",
+        "into",
+        "through",
+        "during",
+        "before",
+        "after",
+    }
+)
+
 
 @dataclass
 class DetectedPattern:
@@ -21,6 +54,29 @@ class DetectedPattern:
     confidence: float
 
 
+@dataclass(slots=True)
+class EmailIndex:
+    """Inverted index over an email collection for repeated pattern lookups.
+
+    Built by PatternDetector.build_email_index(); the lists keep the
+    emails in collection order.
+    """
+
+    emails: Sequence[Email]
+    by_domain: dict[str, list[Email]]
+    by_sender: dict[str, list[Email]]
+    # Every whitespace-separated lowercase subject token -> email positions
+    by_token: dict[str, list[int]]
+
+
+@dataclass(slots=True)
+class _PatternStats:
+    """Occurrence counts and example subjects per value of one pattern type."""
+
+    counts: dict[str, int]
+    examples: dict[str, list[str]]
+
+
 class PatternDetector:
     """Domain service for detecting patterns in email collections.
 
@@ -59,16 +115,31 @@ class PatternDetector:
         if not emails:
             return []
 
+        domains, keywords, senders = self._collect_stats(emails)
+        total_emails = len(emails)
+
         patterns = []
 
         # Detect sender domain patterns
-        patterns.extend(self._detect_sender_domain_patterns(emails))
+        patterns.extend(
+            self._build_patterns(
+                "sender_domain", domains, self.min_frequency, total_emails * 0.1
+            )
+        )
 
         # Detect subject keyword patterns
-        patterns.extend(self._detect_subject_keyword_patterns(emails))
-
-        # Detect specific sender patterns
-        patterns.extend(self._detect_sender_address_patterns(emails))
+        patterns.extend(
+            self._build_patterns(
+                "subject_keyword", keywords, self.min_frequency, total_emails * 0.15
+            )
+        )
+
+        # Detect specific sender patterns (higher threshold for specific senders)
+        patterns.extend(
+            self._build_patterns(
+                "sender_address", senders, self.min_frequency + 2, total_emails * 0.08
+            )
+        )
 
         # Filter by confidence and sort
         valid_patterns = [p for p in patterns if p.confidence >= self.min_confidence]
@@ -76,192 +147,160 @@ class PatternDetector:
 
         return valid_patterns
 
-    def _detect_sender_domain_patterns(self, emails: Sequence[Email]) -> list[DetectedPattern]:
-        """Detect patterns based on sender domains.
+    def _collect_stats(
+        self, emails: Sequence[Email]
+    ) -> tuple[_PatternStats, _PatternStats, _PatternStats]:
+        """Count sender domains, subject keywords and sender addresses in one pass.
 
         Args:
             emails: Email collection to analyze
 
         Returns:
-            List of domain-based patterns
+            Stats for sender domains, subject keywords and sender addresses
         """
-        domain_data: dict[str, dict] = defaultdict(lambda: {"count": 0, "subjects": []})
-
+        max_examples = self.max_examples
+        domains = _PatternStats({}, {})
+        keywords = _PatternStats({}, {})
+        senders = _PatternStats({}, {})
+        domain_counts, domain_examples = domains.counts, domains.examples
+        keyword_counts, keyword_examples = keywords.counts, keywords.examples
+        sender_counts, sender_examples = senders.counts, senders.examples
+
+        # Each email counts at most once per value, so a value's first
+        # max_examples occurrences are exactly the ones to keep as examples
         for email in emails:
-            domain = email.sender.domain
-            domain_data[domain]["count"] += 1
-            if len(domain_data[domain]["subjects"]) < self.max_examples:
-                domain_data[domain]["subjects"].append(email.subject)
+            subject = email.subject
 
-        patterns = []
-        total_emails = len(emails)
-
-        for domain, data in domain_data.items():
-            count = data["count"]
-            if count >= self.min_frequency:
-                # Calculate confidence based on frequency
-                confidence = min(1.0, count / (total_emails * 0.1))
-
-                patterns.append(
-                    DetectedPattern(
-                        pattern_type="sender_domain",
-                        value=domain,
-                        frequency=count,
-                        email_count=count,
-                        example_subjects=data["subjects"][: self.max_examples],
-                        confidence=confidence,
-                    )
-                )
-
-        return patterns
+            domain = email.sender.domain
+            count = domain_counts[domain] = domain_counts.get(domain, 0) + 1
+            if count <= max_examples:
+                domain_examples.setdefault(domain, []).append(subject)
 
-    def _detect_subject_keyword_patterns(self, emails: Sequence[Email]) -> list[DetectedPattern]:
-        """Detect patterns based on subject keywords.
+            sender = email.sender.value
+            count = sender_counts[sender] = sender_counts.get(sender, 0) + 1
+            if count <= max_examples:
+                sender_examples.setdefault(sender, []).append(subject)
+
+            # Extract words from the cached lowercase subject, so no word
+            # needs lowercasing on its own
+            words = {
+                word
+                for word in email.subject_lower.split()
+                if len(word) >= 3 and word not in STOP_WORDS
+            }
+            for word in words:
+                count = keyword_counts[word] = keyword_counts.get(word, 0) + 1
+                if count <= max_examples:
+                    keyword_examples.setdefault(word, []).append(subject)
+
+        return domains, keywords, senders
+
+    def _build_patterns(
+        self, pattern_type: str, stats: _PatternStats, min_count: int, full_confidence_at: float
+    ) -> list[DetectedPattern]:
+        """Turn value counts into patterns.
 
         Args:
-            emails: Email collection to analyze
+            pattern_type: Type of the detected patterns
+            stats: Counts and example subjects from _collect_stats()
+            min_count: Minimum occurrences of a value to report it
+            full_confidence_at: Occurrences at which confidence reaches 1.0
 
         Returns:
-            List of keyword-based patterns
+            One pattern per value seen at least min_count times
         """
-        keyword_data: dict[str, dict] = defaultdict(lambda: {"count": 0, "subjects": []})
-
-        # Common words to ignore
-        stop_words = {
-            "re",
-            "fwd",
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "from",
-            "up",
-            "out",
-            "if",
-            "about",
-            "as",
-            "into",
-            "through",
-            "during",
-            "before",
-            "after",
-        }
-
-        for email in emails:
-            # Extract words from subject (lowercase, alphanumeric only)
-            words = [
-                word.lower()
-                for word in email.subject.split()
-                if len(word) >= 3 and word.lower() not in stop_words
-            ]
-
-            # Track each unique word
-            unique_words = set(words)
-            for word in unique_words:
-                keyword_data[word]["count"] += 1
-                if len(keyword_data[word]["subjects"]) < self.max_examples:
-                    keyword_data[word]["subjects"].append(email.subject)
-
         patterns = []
-        total_emails = len(emails)
 
-        for keyword, data in keyword_data.items():
-            count = data["count"]
-            if count >= self.min_frequency:
+        for value, count in stats.counts.items():
+            if count >= min_count:
                 # Calculate confidence based on frequency
-                confidence = min(1.0, count / (total_emails * 0.15))
+                confidence = min(1.0, count / full_confidence_at)
 
                 patterns.append(
                     DetectedPattern(
-                        pattern_type="subject_keyword",
-                        value=keyword,
+                        pattern_type=pattern_type,
+                        value=value,
                         frequency=count,
                         email_count=count,
-                        example_subjects=data["subjects"][: self.max_examples],
+                        # Collected lists never exceed max_examples and are
+                        # private to this call, so they are handed over as-is
+                        example_subjects=stats.examples.get(value) or [],
                         confidence=confidence,
                     )
                 )
 
         return patterns
 
-    def _detect_sender_address_patterns(self, emails: Sequence[Email]) -> list[DetectedPattern]:
-        """Detect patterns based on specific sender addresses.
+    def build_email_index(self, emails: Sequence[Email]) -> EmailIndex:
+        """Index emails by sender domain, sender address and subject token.
+
+        Build once and pass to group_emails_by_pattern() when grouping the
+        same collection by many patterns.
 
         Args:
-            emails: Email collection to analyze
+            emails: Email collection to index
 
         Returns:
-            List of sender address-based patterns
+            Index over the collection
         """
-        sender_data: dict[str, dict] = defaultdict(lambda: {"count": 0, "subjects": []})
+        by_domain: dict[str, list[Email]] = {}
+        by_sender: dict[str, list[Email]] = {}
+        by_token: dict[str, list[int]] = {}
 
-        for email in emails:
-            sender = email.sender.value
-            sender_data[sender]["count"] += 1
-            if len(sender_data[sender]["subjects"]) < self.max_examples:
-                sender_data[sender]["subjects"].append(email.subject)
-
-        patterns = []
-        total_emails = len(emails)
-
-        for sender, data in sender_data.items():
-            count = data["count"]
-            # Use higher threshold for specific senders
-            if count >= self.min_frequency + 2:
-                # Calculate confidence based on frequency
-                confidence = min(1.0, count / (total_emails * 0.08))
-
-                patterns.append(
-                    DetectedPattern(
-                        pattern_type="sender_address",
-                        value=sender,
-                        frequency=count,
-                        email_count=count,
-                        example_subjects=data["subjects"][: self.max_examples],
-                        confidence=confidence,
-                    )
-                )
+        for position, email in enumerate(emails):
+            by_domain.setdefault(email.sender.domain, []).append(email)
+            by_sender.setdefault(email.sender.value, []).append(email)
+            for token in set(email.subject_lower.split()):
+                by_token.setdefault(token, []).append(position)
 
-        return patterns
+        return EmailIndex(emails, by_domain, by_sender, by_token)
 
     def group_emails_by_pattern(
-        self, emails: Sequence[Email], pattern: DetectedPattern
+        self,
+        emails: Sequence[Email],
+        pattern: DetectedPattern,
+        index: EmailIndex | None = None,
     ) -> list[Email]:
         """Get all emails matching a specific pattern.
 
         Args:
             emails: Email collection to filter
             pattern: Pattern to match against
+            index: Index from build_email_index() over the same emails, to
+                look matches up instead of scanning every email
 
         Returns:
             List of emails matching the pattern
         """
-        matching_emails = []
-
-        for email in emails:
-            matches = False
+        value = pattern.value
 
+        if index is not None:
             if pattern.pattern_type == "sender_domain":
-                matches = email.sender.domain == pattern.value
-            elif pattern.pattern_type == "subject_keyword":
-                matches = pattern.value.lower() in email.subject.lower()
+                return list(index.by_domain.get(value, ()))
             elif pattern.pattern_type == "sender_address":
-                matches = email.sender.value == pattern.value
-
-            if matches:
-                matching_emails.append(email)
-
-        return matching_emails
+                return list(index.by_sender.get(value, ()))
+            elif pattern.pattern_type == "subject_keyword":
+                keyword = value.lower()
+                # A keyword without whitespace occurs in a subject exactly when
+                # it occurs in one of its tokens, so search the (much smaller)
+                # token vocabulary instead of every subject
+                if keyword.split() == [keyword]:
+                    positions: set[int] = set()
+                    for token, token_positions in index.by_token.items():
+                        if keyword in token:
+                            positions.update(token_positions)
+                    return [index.emails[position] for position in sorted(positions)]
+
+        # Resolve the pattern type once, then filter with a single test
+        if pattern.pattern_type == "sender_domain":
+            return [email for email in emails if email.sender.domain == value]
+        elif pattern.pattern_type == "subject_keyword":
+            keyword = value.lower()
+            return [email for email in emails if keyword in email.subject_lower]
+        elif pattern.pattern_type == "sender_address":
+            return [email for email in emails if email.sender.value == value]
+
+        return []
 
     def analyze_email_distribution(self, emails: Sequence[Email]) -> dict[str, int]:
         """Analyze distribution of emails across folders.
@@ -1,7 +1,10 @@
 """EmailAddress value object with validation."""
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# RFC 5322 simplified address format
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
 
 @dataclass(frozen=True, slots=True)
@@ -13,17 +16,21 @@ class EmailAddress:
     """
 
     value: str
+    _value_lower: str = field(init=False, repr=False, compare=False)
+    _domain_lower: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Validate email address format on construction."""
         if not self._is_valid(self.value):
             raise ValueError(f"Invalid email address: {self.value}")
+        # Normalize once; domain and sender matching run for every email and pattern
+        object.__setattr__(self, "_value_lower", self.value.lower())
+        object.__setattr__(self, "_domain_lower", self.domain.lower())
 
     @staticmethod
     def _is_valid(email: str) -> bool:
         """Check if email format is valid using RFC 5322 simplified regex."""
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
 
     @property
     def domain(self) -> str:
@@ -35,9 +42,19 @@ class EmailAddress:
         """Extract local part (before @) from email address."""
         return self.value.split("@")[0] if "@" in self.value else self.value
 
+    @property
+    def value_lower(self) -> str:
+        """Lowercased address."""
+        return self._value_lower
+
+    @property
+    def domain_lower(self) -> str:
+        """Lowercased domain."""
+        return self._domain_lower
+
     def matches_domain(self, domain: str) -> bool:
         """Check if email address belongs to specified domain."""
-        return self.domain.lower() == domain.lower()
+        return self._domain_lower == domain.lower()
 
     def __str__(self) -> str:
         return self.value
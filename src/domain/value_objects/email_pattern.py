@@ -1,7 +1,33 @@
 """EmailPattern value object for detected patterns in emails."""
 
+from __future__ import annotations
+
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Self
+from functools import lru_cache
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from ..entities.email import Email
+
+
+@lru_cache(maxsize=4096)
+def _build_predicate(pattern_type: str, value: str) -> Callable[[Email], bool]:
+    """Build a matcher specialized for a pattern type and value.
+
+    Cached by (pattern_type, value), so the pattern kind is resolved once
+    per distinct pattern instead of on every match, while EmailPattern
+    itself stays plain data.
+    """
+    value = value.lower()
+    if pattern_type == "domain":
+        return lambda email: email.sender.domain_lower == value
+    elif pattern_type == "subject":
+        return lambda email: value in email.subject_lower
+    elif pattern_type == "sender":
+        return lambda email: value in email.sender.value_lower
+    else:
+        return lambda email: False
 
 
 @dataclass(frozen=True, slots=True)
@@ -28,6 +54,10 @@ class EmailPattern:
         if self.sample_count < 0:
             raise ValueError("Sample count cannot be negative")
 
+    def predicate(self) -> Callable[[Email], bool]:
+        """Matcher that returns True for emails matching this pattern."""
+        return _build_predicate(self.pattern_type, self.value)
+
     @classmethod
     def from_domain(cls, domain: str, confidence: float, sample_count: int = 0) -> Self:
         """Factory method to create domain pattern."""
@@ -1,6 +1,6 @@
 """FilterCondition value object for Sieve filter conditions."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dataclass_field
 from enum import Enum
 from typing import Self
 
@@ -70,6 +70,9 @@ class FilterCondition:
     field: str  # e.g., "subject", "from", "to"
     match_type: MatchType
     value: str
+    # Lowercased value for the case-insensitive validators and matchers
+    # (dataclass_field: the "field" attribute above shadows the usual name)
+    _value_lower: str = dataclass_field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Validate condition on construction."""
@@ -77,6 +80,12 @@ class FilterCondition:
             raise ValueError("Field cannot be empty")
         if not self.value:
             raise ValueError("Value cannot be empty")
+        object.__setattr__(self, "_value_lower", self.value.lower())
+
+    @property
+    def value_lower(self) -> str:
+        """Lowercased value."""
+        return self._value_lower
 
     @classmethod
     def header_contains(cls, field: str, value: str) -> Self:
@@ -189,6 +198,36 @@ class FilterCondition:
         # Default to subject contains
         return [cls.header_contains("subject", pattern)]
 
+    @classmethod
+    def try_from_pattern_multi(cls, pattern: str) -> list[Self] | None:
+        """Like from_pattern_multi(), but return None for invalid patterns.
+
+        Checks up front what construction would reject (placeholder or
+        generic domains, empty values), so callers skipping invalid
+        patterns need no exception handling.
+
+        Returns:
+            List of FilterCondition objects, or None if the pattern is invalid
+        """
+        pattern = pattern.strip()
+
+        if pattern.startswith("from:"):
+            value = pattern[5:].strip()
+            if value.startswith("@"):
+                if not cls.is_valid_domain(value[1:]):
+                    return None
+                return [cls.address_domain_is("from", value[1:])]
+            return [cls.header_contains("from", value)] if value else None
+
+        if pattern.startswith("subject:"):
+            value = pattern[8:].strip()
+            if "," in value:
+                keywords = [kw.strip() for kw in value.split(",") if kw.strip()]
+                return [cls.header_contains("subject", kw) for kw in keywords]
+            return [cls.header_contains("subject", value)] if value else None
+
+        return [cls.header_contains("subject", pattern)] if pattern else None
+
     def to_sieve(self) -> str:
         """Convert condition to Sieve script syntax."""
         if self.condition_type == ConditionType.ADDRESS_DOMAIN:
@@ -1,6 +1,6 @@
 """FilterRule value object representing a complete filter rule."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Self
 
 from .filter_action import FilterAction
@@ -22,6 +22,8 @@ class FilterRule:
     logical_operator: str = "anyof"  # "anyof" (OR) or "allof" (AND)
     name: str = ""
     description: str = ""
+    # Rendered Sieve text, filled on first to_sieve() call
+    _sieve: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Validate rule on construction."""
@@ -51,7 +53,13 @@ class FilterRule:
         )
 
     def to_sieve(self) -> str:
-        """Convert rule to Sieve script syntax."""
+        """Convert rule to Sieve script syntax.
+
+        The rule is immutable, so the text is rendered once and reused.
+        """
+        if self._sieve is not None:
+            return self._sieve
+
         lines = []
 
         # Add name and description as comments
@@ -76,7 +84,9 @@ class FilterRule:
 
         lines.append("}")
 
-        return "\n".join(lines)
+        sieve = "\n".join(lines)
+        object.__setattr__(self, "_sieve", sieve)
+        return sieve
 
     def matches_all_conditions(self) -> bool:
         """Check if rule requires all conditions to match (AND logic)."""
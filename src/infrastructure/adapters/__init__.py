@@ -1,10 +1,12 @@
 """Infrastructure adapters - Implementations of application ports."""
 
+from .aho_corasick_searcher import AhoCorasickNeedleSearcher
 from .imap_adapter import IMAPAdapter
 from .ollama_adapter import OllamaAdapter
 from .sieve_file_adapter import SieveFileAdapter
 
 __all__ = [
+    "AhoCorasickNeedleSearcher",
     "IMAPAdapter",
     "OllamaAdapter",
     "SieveFileAdapter",
@@ -0,0 +1,49 @@
+"""Aho-Corasick needle searcher for FilterMatcher."""
+
+from __future__ import annotations
+
+from typing import Collection, Iterator
+
+from src.domain.services.filter_matcher import NeedleSearcher, NeedleSearcherFactory
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: FilterMatcher falls back to substring tests
+    ahocorasick = None
+
+
+class AhoCorasickNeedleSearcher(NeedleSearcher):
+    """Finds all needles of a field in one pass using pyahocorasick."""
+
+    def __init__(self, needles: Collection[str]) -> None:
+        """Build the automaton over the needles.
+
+        Args:
+            needles: Lowercased CONTAINS values of one field
+
+        Raises:
+            ImportError: If pyahocorasick is not installed
+        """
+        if ahocorasick is None:
+            raise ImportError("pyahocorasick not available")
+
+        self._automaton = ahocorasick.Automaton()
+        for needle in needles:
+            self._automaton.add_word(needle, needle)
+        self._automaton.make_automaton()
+
+    def find(self, text: str) -> Iterator[str]:
+        """Find the needles occurring in text.
+
+        Args:
+            text: Lowercased field value to scan
+
+        Returns:
+            Needles found in text, once per occurrence
+        """
+        return (needle for _, needle in self._automaton.iter(text))
+
+
+def aho_corasick_searcher_factory() -> NeedleSearcherFactory | None:
+    """Get the searcher factory, or None if pyahocorasick is not installed."""
+    return AhoCorasickNeedleSearcher if ahocorasick is not None else None
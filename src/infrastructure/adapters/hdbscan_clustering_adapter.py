@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Sequence
+from typing import Iterator, Sequence
 
 import hdbscan
 import numpy as np
@@ -52,7 +52,7 @@ class HDBSCANClusteringAdapter(IClusteringService):
     def cluster_emails(
         self,
         emails: Sequence[Email],
-        embeddings: NDArray[np.float32],
+        embeddings: NDArray[np.floating],
         min_cluster_size: int = 5,
     ) -> list[EmailCluster]:
         """Cluster emails based on their embedding vectors.
@@ -65,8 +65,30 @@ class HDBSCANClusteringAdapter(IClusteringService):
         Returns:
             List of EmailCluster objects (excludes noise/outliers)
         """
+        return [
+            cluster
+            for batch in self.cluster_emails_stream(emails, embeddings, min_cluster_size)
+            for cluster in batch
+        ]
+
+    def cluster_emails_stream(
+        self,
+        emails: Sequence[Email],
+        embeddings: NDArray[np.floating],
+        min_cluster_size: int = 5,
+    ) -> Iterator[list[EmailCluster]]:
+        """Cluster emails, yielding the main clusters before re-clustering outliers.
+
+        Args:
+            emails: Collection of emails to cluster
+            embeddings: 2D array of email embeddings (n_emails, embedding_dim)
+            min_cluster_size: Minimum number of emails to form a cluster
+
+        Yields:
+            Main HDBSCAN clusters, then any clusters recovered from outliers
+        """
         if len(emails) == 0:
-            return []
+            return
 
         if len(emails) < min_cluster_size:
             logger.warning(
@@ -74,13 +96,14 @@ class HDBSCANClusteringAdapter(IClusteringService):
                 f"(min_cluster_size={min_cluster_size}). Creating single cluster."
             )
             # Put all emails in one cluster
-            return [
+            yield [
                 EmailCluster.create(
                     cluster_id=0,
                     emails=emails,
                     centroid_indices=list(range(min(3, len(emails)))),
                 )
             ]
+            return
 
         logger.info(f"Clustering {len(emails)} emails...")
 
@@ -135,6 +158,10 @@ class HDBSCANClusteringAdapter(IClusteringService):
                 f"representatives: {centroid_indices[:3]}"
             )
 
+        # Main clusters are final; hand them out before the outlier pass
+        if clusters:
+            yield clusters
+
         # Handle outliers by re-clustering with lower thresholds
         if self.handle_outliers and n_noise >= self.outlier_min_cluster_size:
             logger.info(f"Re-clustering {n_noise} outliers with lower thresholds...")
@@ -152,18 +179,16 @@ class HDBSCANClusteringAdapter(IClusteringService):
             )
 
             if outlier_clusters:
-                clusters.extend(outlier_clusters)
                 logger.info(
                     f"Re-clustering created {len(outlier_clusters)} additional clusters "
                     f"from {sum(c.size for c in outlier_clusters)} outliers"
                 )
-
-        return clusters
+                yield outlier_clusters
 
     def find_representative_indices(
         self,
         cluster_emails: Sequence[Email],
-        cluster_embeddings: NDArray[np.float32],
+        cluster_embeddings: NDArray[np.floating],
         n_representatives: int = 3,
     ) -> list[int]:
         """Find indices of emails closest to cluster center.
@@ -197,7 +222,7 @@ class HDBSCANClusteringAdapter(IClusteringService):
     def _recluster_outliers(
         self,
         outlier_emails: Sequence[Email],
-        outlier_embeddings: NDArray[np.float32],
+        outlier_embeddings: NDArray[np.floating],
         next_cluster_id: int,
     ) -> list[EmailCluster]:
         """Re-cluster outliers with more lenient parameters.
@@ -5,16 +5,33 @@ from __future__ import annotations
 import email
 import imaplib
 import logging
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from email.header import decode_header
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from src.application.ports.i_email_fetcher import IEmailFetcher
 from src.domain.entities.email import Email
 from src.domain.value_objects.email_address import EmailAddress
+from src.shared.imap_list import parse_list_names, unescape_quoted
 
 logger = logging.getLogger(__name__)
 
+# Only the first bytes of each message are fetched: headers plus the start of
+# the body are all that is kept (the body is cut to 500 chars), so there is no
+# point transferring attachments
+MAX_MESSAGE_FETCH_BYTES = 64 * 1024
+
+# Most extra connections opened for calls from threads other than the one that
+# called connect(); they are kept and reused until disconnect()
+MAX_WORKER_CONNECTIONS = 4
+
+_STATUS_MESSAGES_RE = re.compile(rb"MESSAGES (\d+)")
+# Untagged STATUS response: mailbox name (quoted or atom) and its counters
+_STATUS_RESPONSE_RE = re.compile(rb'^(?:"((?:[^"\\]|\\.)*)"|(\S+)) \((.*)\)\s*$')
+
 
 class IMAPAdapter(IEmailFetcher):
     """IMAP adapter for fetching emails."""
@@ -42,6 +59,18 @@ class IMAPAdapter(IEmailFetcher):
         self.use_ssl = use_ssl
         self.port = port or (993 if use_ssl else 143)
         self.connection: imaplib.IMAP4_SSL | imaplib.IMAP4 | None = None
+        # Mailbox currently selected on the main connection
+        self._selected_folder: str | None = None
+        # Whether the server supports LIST-STATUS (RFC 5819); checked lazily
+        self._list_status_supported: bool | None = None
+
+        # IMAP connections are not thread-safe: threads other than the one
+        # that called connect() borrow a connection from a bounded pool
+        self._owner_thread: int | None = None
+        self._worker_connections: list[imaplib.IMAP4] = []
+        self._idle_connections: list[imaplib.IMAP4] = []
+        self._worker_slots = threading.BoundedSemaphore(MAX_WORKER_CONNECTIONS)
+        self._worker_lock = threading.Lock()
 
         logger.info(f"Initialized IMAP adapter for {server}")
 
@@ -52,20 +81,71 @@ class IMAPAdapter(IEmailFetcher):
             ConnectionError: If connection fails
         """
         try:
-            if self.use_ssl:
-                self.connection = imaplib.IMAP4_SSL(self.server, self.port)
-            else:
-                self.connection = imaplib.IMAP4(self.server, self.port)
-
-            self.connection.login(self.username, self.password)
+            self.connection = self._open_connection()
+            self._owner_thread = threading.get_ident()
+            self._selected_folder = None
+            self._list_status_supported = None
             logger.info(f"Connected to IMAP server {self.server}")
 
         except Exception as e:
             logger.error(f"Failed to connect to IMAP server: {e}")
             raise ConnectionError(f"IMAP connection failed: {e}") from e
 
+    def _open_connection(self) -> imaplib.IMAP4:
+        """Open and log in a new IMAP connection."""
+        if self.use_ssl:
+            connection = imaplib.IMAP4_SSL(self.server, self.port)
+        else:
+            connection = imaplib.IMAP4(self.server, self.port)
+        connection.login(self.username, self.password)
+        return connection
+
+    @contextmanager
+    def _thread_connection(self) -> Iterator[imaplib.IMAP4]:
+        """Borrow an IMAP connection the calling thread may use.
+
+        The thread that called connect() uses the main connection. Other
+        threads take an idle pooled connection, opening one only while fewer
+        than MAX_WORKER_CONNECTIONS exist, and block otherwise.
+        """
+        if threading.get_ident() == self._owner_thread:
+            yield self.connection
+            return
+
+        with self._worker_slots:
+            with self._worker_lock:
+                connection = self._idle_connections.pop() if self._idle_connections else None
+            if connection is None:
+                connection = self._open_connection()
+                with self._worker_lock:
+                    self._worker_connections.append(connection)
+
+            try:
+                yield connection
+            except Exception:
+                # A connection that failed mid-command may be unusable
+                with self._worker_lock:
+                    self._worker_connections.remove(connection)
+                try:
+                    connection.logout()
+                except Exception:
+                    pass
+                raise
+            with self._worker_lock:
+                self._idle_connections.append(connection)
+
     def disconnect(self) -> None:
         """Close connection to IMAP server."""
+        with self._worker_lock:
+            worker_connections = self._worker_connections
+            self._worker_connections = []
+            self._idle_connections = []
+        for connection in worker_connections:
+            try:
+                connection.logout()
+            except Exception as e:
+                logger.warning(f"Error closing worker connection: {e}")
+
         if self.connection:
             try:
                 self.connection.logout()
@@ -74,13 +154,14 @@ class IMAPAdapter(IEmailFetcher):
                 logger.warning(f"Error during disconnect: {e}")
             finally:
                 self.connection = None
+                self._selected_folder = None
 
     def fetch_emails(
         self,
         folder: str = "INBOX",
         since_date: datetime | None = None,
         max_emails: int | None = None,
-        exclude_folders: list[str] | None = None,
+        exclude_folders: frozenset[str] | None = None,
     ) -> Sequence[Email]:
         """Fetch emails from server.
 
@@ -100,13 +181,20 @@ class IMAPAdapter(IEmailFetcher):
         if not self.connection:
             raise ConnectionError("Not connected. Call connect() first.")
 
+        if exclude_folders and folder in exclude_folders:
+            logger.info(f"Folder '{folder}' is excluded, skipping")
+            return []
+
         logger.info(f"Fetching emails from folder '{folder}'...")
 
         try:
-            # Select folder
-            status, _ = self.connection.select(f'"{folder}"', readonly=True)
-            if status != "OK":
-                raise Exception(f"Failed to select folder {folder}")
+            # Select folder, unless it is already selected on this connection
+            if self._selected_folder != folder:
+                self._selected_folder = None
+                status, _ = self.connection.select(f'"{folder}"', readonly=True)
+                if status != "OK":
+                    raise Exception(f"Failed to select folder {folder}")
+                self._selected_folder = folder
 
             # Build search criteria
             if since_date:
@@ -162,18 +250,7 @@ class IMAPAdapter(IEmailFetcher):
             if status != "OK":
                 return []
 
-            folders = []
-            for folder_data in folder_list:
-                folder_str = (
-                    folder_data.decode() if isinstance(folder_data, bytes) else folder_data
-                )
-                parts = folder_str.split('"')
-
-                if len(parts) >= 3:
-                    folder_name = parts[-1].strip()
-                    if folder_name:
-                        folders.append(folder_name)
-
+            folders = parse_list_names(folder_list)
             logger.info(f"Found {len(folders)} folders")
             return folders
 
@@ -181,6 +258,57 @@ class IMAPAdapter(IEmailFetcher):
             logger.error(f"Error listing folders: {e}")
             return []
 
+    def list_folders_with_counts(self) -> dict[str, int] | None:
+        """List all folders with their email counts using LIST-STATUS.
+
+        Returns:
+            Dictionary mapping folder names to email counts, or None if the
+            server does not support LIST-STATUS or the request fails
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected. Call connect() first.")
+
+        try:
+            if self._list_status_supported is None:
+                # Capabilities can change after login, so ask again
+                status, data = self.connection.capability()
+                capabilities = data[0].upper().split() if status == "OK" and data[0] else []
+                self._list_status_supported = b"LIST-STATUS" in capabilities
+            if not self._list_status_supported:
+                return None
+
+            status, _ = self.connection.xatom("LIST", '""', '"*"', "RETURN (STATUS (MESSAGES))")
+            _, folder_list = self.connection.response("LIST")
+            _, status_list = self.connection.response("STATUS")
+            if status != "OK":
+                return None
+
+            counts = {}
+            for status_data in status_list:
+                if not isinstance(status_data, bytes):
+                    continue
+                match = _STATUS_RESPONSE_RE.match(status_data)
+                if not match:
+                    continue
+                if match.group(1) is not None:
+                    name = unescape_quoted(match.group(1))
+                else:
+                    name = match.group(2)
+                messages = _STATUS_MESSAGES_RE.search(match.group(3))
+                if messages:
+                    counts[name.decode(errors="replace")] = int(messages.group(1))
+
+            # Non-selectable folders have no STATUS response; count them as empty
+            folders = parse_list_names(folder_list)
+            folder_counts = {folder: counts.get(folder, 0) for folder in folders}
+            logger.info(f"Found {len(folder_counts)} folders via LIST-STATUS")
+            return folder_counts
+
+        except Exception as e:
+            logger.warning(f"LIST-STATUS failed, falling back to per-folder counts: {e}")
+            self._list_status_supported = False
+            return None
+
     def get_folder_count(self, folder: str) -> int:
         """Get email count for a folder.
 
@@ -194,10 +322,13 @@ class IMAPAdapter(IEmailFetcher):
             raise ConnectionError("Not connected. Call connect() first.")
 
         try:
-            status, messages = self.connection.select(f'"{folder}"', readonly=True)
+            # STATUS reads the count without changing the selected mailbox
+            with self._thread_connection() as connection:
+                status, data = connection.status(f'"{folder}"', "(MESSAGES)")
             if status == "OK":
-                count = int(messages[0].decode())
-                return count
+                match = _STATUS_MESSAGES_RE.search(data[0])
+                if match:
+                    return int(match.group(1))
             return 0
         except Exception as e:
             logger.error(f"Error getting folder count: {e}")
@@ -214,7 +345,9 @@ class IMAPAdapter(IEmailFetcher):
             Email entity or None
         """
         try:
-            status, msg_data = self.connection.fetch(msg_id, "(RFC822)")
+            status, msg_data = self.connection.fetch(
+                msg_id, f"(BODY.PEEK[]<0.{MAX_MESSAGE_FETCH_BYTES}>)"
+            )
             if status != "OK":
                 return None
 
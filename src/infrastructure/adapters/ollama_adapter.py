@@ -2,20 +2,32 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Sequence
 
 import requests
 
-from src.application.ports.i_llm_service import ILLMService
+from src.application.ports.i_llm_service import CATEGORY_SCHEMA, ILLMService
+from src.application.services.category_merge import merge_categories
 from src.domain.entities.email import Email
 from src.domain.value_objects.email_cluster import EmailCluster
 from src.domain.value_objects.email_summary import EmailSummary
+from src.infrastructure.cache.llm_response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Approximate prompt budget (in tokens) for the summaries and existing-folders
+# section of one master call; larger summary sets are split into chunks
+# analyzed concurrently and merged
+MASTER_CHUNK_TOKENS = 3500
+
+# Rough characters-per-token ratio used to estimate prompt size
+_CHARS_PER_TOKEN = 4
+
 
 class OllamaAdapter(ILLMService):
     """Ollama adapter for local LLM analysis."""
@@ -27,6 +39,9 @@ class OllamaAdapter(ILLMService):
         temperature: float = 0.7,
         num_predict: int = 6000,
         top_p: float = 0.9,
+        structured_output: bool = False,
+        response_cache: LLMResponseCache | None = None,
+        max_parallel_workers: int = 3,
     ) -> None:
         """Initialize Ollama adapter.
 
@@ -36,12 +51,22 @@ class OllamaAdapter(ILLMService):
             temperature: Sampling temperature (0-1, higher = more creative)
             num_predict: Maximum tokens to generate
             top_p: Nucleus sampling parameter
+            structured_output: Constrain responses to CATEGORY_SCHEMA
+                (requires Ollama 0.5+; a request the server rejects for the
+                schema is retried without it)
+            response_cache: Optional cache of parsed responses, reused when
+                the same prompt is sent to the same model again
+            max_parallel_workers: Maximum concurrent master-model calls when
+                a summary set is analyzed in chunks
         """
         self.model = model
         self.base_url = base_url
         self.temperature = temperature
         self.num_predict = num_predict
         self.top_p = top_p
+        self.structured_output = structured_output
+        self.response_cache = response_cache
+        self.max_parallel_workers = max(1, max_parallel_workers)
         self.session = requests.Session()
 
         logger.info(
@@ -92,11 +117,8 @@ class OllamaAdapter(ILLMService):
         prompt = self._create_analysis_prompt(email_sample)
 
         try:
-            # Call Ollama
-            response_text = self._call_ollama(prompt)
-
-            # Parse response
-            result = self._parse_response(response_text)
+            # Call Ollama and parse response
+            result = self._analyze_prompt(prompt)
 
             logger.info(f"Ollama identified {len(result.get('categories', []))} categories")
             return result
@@ -126,7 +148,8 @@ class OllamaAdapter(ILLMService):
             Dictionary containing hierarchical categories
 
         Raises:
-            Exception: If analysis fails
+            Exception: If analysis fails, including any chunk that also
+                fails its retry
             TimeoutError: If analysis times out
         """
         logger.info(
@@ -135,16 +158,34 @@ class OllamaAdapter(ILLMService):
 
         # Prepare summary sample
         summary_sample = self._prepare_summary_sample(summaries, max_sample)
-
-        # Create master analysis prompt
-        prompt = self._create_master_analysis_prompt(summary_sample, existing_folders)
+        # Every chunk prompt repeats the existing-folders section
+        folders_chars = len(self._create_master_analysis_prompt([], existing_folders)) - len(
+            self._create_master_analysis_prompt([])
+        )
+        chunks = self._chunk_summaries(summary_sample, reserved_chars=folders_chars)
 
         try:
-            # Call Ollama with master model
-            response_text = self._call_ollama(prompt)
-
-            # Parse response
-            result = self._parse_response(response_text)
+            if len(chunks) == 1:
+                result = self._analyze_summary_chunk(chunks[0], existing_folders)
+            else:
+                # Analyze chunks concurrently, then merge their categories
+                logger.info(f"Splitting {len(summary_sample)} summaries into {len(chunks)} chunks")
+                workers = min(self.max_parallel_workers, len(chunks))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(self._analyze_summary_chunk, chunk, existing_folders)
+                        for chunk in chunks
+                    ]
+                    partials = []
+                    for chunk, future in zip(chunks, futures):
+                        try:
+                            partials.append(future.result())
+                        except Exception as e:
+                            # Retry once; merging without this chunk would
+                            # silently drop its categories from the filter
+                            logger.warning(f"Master model chunk failed, retrying: {e}")
+                            partials.append(self._analyze_summary_chunk(chunk, existing_folders))
+                result = merge_categories(partials)
 
             logger.info(f"Master model identified {len(result.get('categories', []))} categories")
             return result
@@ -153,6 +194,56 @@ class OllamaAdapter(ILLMService):
             logger.error(f"Master model analysis failed: {e}", exc_info=True)
             raise
 
+    def _analyze_summary_chunk(
+        self,
+        summary_sample: list[dict[str, Any]],
+        existing_folders: dict[str, int] | None = None,
+    ) -> dict[str, Any]:
+        """Run one master-model analysis over a chunk of summaries.
+
+        Args:
+            summary_sample: Summary data dictionaries for this chunk
+            existing_folders: Optional dict of existing folder names to email counts
+
+        Returns:
+            Parsed categories for this chunk
+        """
+        prompt = self._create_master_analysis_prompt(summary_sample, existing_folders)
+        return self._analyze_prompt(prompt)
+
+    @staticmethod
+    def _chunk_summaries(
+        summary_sample: list[dict[str, Any]],
+        max_tokens: int = MASTER_CHUNK_TOKENS,
+        reserved_chars: int = 0,
+    ) -> list[list[dict[str, Any]]]:
+        """Pack summaries into chunks whose estimated prompt size fits a budget.
+
+        Args:
+            summary_sample: Summary data dictionaries
+            max_tokens: Approximate token budget per chunk
+            reserved_chars: Prompt characters repeated in every chunk, taken
+                off the budget; at least a quarter of it is always left for
+                summaries so a long header cannot split every email apart
+
+        Returns:
+            Non-empty list of chunks (a single, possibly empty, chunk if
+            everything fits)
+        """
+        budget = max_tokens * _CHARS_PER_TOKEN
+        budget = max(budget - reserved_chars, budget // 4)
+        chunks: list[list[dict[str, Any]]] = [[]]
+        used = 0
+        for summary in summary_sample:
+            # Matches the per-email block in the master prompt closely enough
+            size = 60 + sum(len(str(value)) for value in summary.values())
+            if chunks[-1] and used + size > budget:
+                chunks.append([])
+                used = 0
+            chunks[-1].append(summary)
+            used += size
+        return chunks
+
     def analyze_clusters(
         self,
         clusters: Sequence[EmailCluster],
@@ -187,11 +278,8 @@ class OllamaAdapter(ILLMService):
         )
 
         try:
-            # Call Ollama with master model
-            response_text = self._call_ollama(prompt)
-
-            # Parse response
-            result = self._parse_response(response_text)
+            # Call Ollama with master model and parse response
+            result = self._analyze_prompt(prompt)
 
             logger.info(f"Master model identified {len(result.get('categories', []))} categories")
             return result
@@ -239,14 +327,50 @@ class OllamaAdapter(ILLMService):
             "status": "unknown",
         }
 
-    def _call_ollama(self, prompt: str) -> str:
+    def _analyze_prompt(self, prompt: str) -> dict[str, Any]:
+        """Send an analysis prompt and parse the categories, using the cache.
+
+        Args:
+            prompt: Analysis prompt
+
+        Returns:
+            Parsed categories
+        """
+        if self.response_cache is not None:
+            # A schema-constrained request may have been answered without the
+            # schema by a server that rejects it, so accept that entry too
+            for structured_output in dict.fromkeys((self.structured_output, False)):
+                cached = self.response_cache.get(self._cache_key(prompt, structured_output))
+                if cached is not None:
+                    logger.info(f"Using cached response from {self.model}")
+                    return cached
+
+        text, structured_output = self._call_ollama(prompt, self.structured_output)
+        result = self._parse_response(text)
+
+        if self.response_cache is not None:
+            # Keyed by how the response was actually generated
+            self.response_cache.put(self._cache_key(prompt, structured_output), result)
+        return result
+
+    def _cache_key(self, prompt: str, structured_output: bool) -> str:
+        """Cache key for the response to `prompt` under the given settings."""
+        settings = (
+            f"{self.model}\0{self.temperature}\0{self.num_predict}\0{self.top_p}\0"
+            f"{structured_output}"
+        )
+        return hashlib.blake2b(f"{settings}\0{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _call_ollama(self, prompt: str, structured_output: bool = False) -> tuple[str, bool]:
         """Call Ollama API.
 
         Args:
             prompt: Analysis prompt
+            structured_output: Constrain the response to CATEGORY_SCHEMA; if
+                the server rejects the schema, this call retries without it
 
         Returns:
-            Response text
+            Response text, and whether it was generated with the schema
 
         Raises:
             TimeoutError: If request times out
@@ -254,24 +378,43 @@ class OllamaAdapter(ILLMService):
         """
         logger.info(f"Calling Ollama with model {self.model}...")
 
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.num_predict,
+                "top_p": self.top_p,
+            },
+        }
+        if structured_output:
+            # Constrained decoding: the response is always valid JSON
+            payload["format"] = CATEGORY_SCHEMA
+
         response = self.session.post(
             f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": self.temperature,
-                    "num_predict": self.num_predict,
-                    "top_p": self.top_p,
-                },
-            },
+            json=payload,
             timeout=600,  # 10 minutes for local models
         )
+        if response.status_code == 400 and "format" in payload:
+            # Servers before Ollama 0.5 reject a JSON schema as format; the
+            # fallback stays local to this call, other threads may be sending
+            logger.warning(
+                "Ollama rejected the structured output schema, retrying without it: %s",
+                response.text,
+            )
+            structured_output = False
+            del payload["format"]
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=600,
+            )
         response.raise_for_status()
 
         result = response.json()
-        return result.get("response", "")
+        return result.get("response", ""), structured_output
 
     def _prepare_summary_sample(
         self, summaries: Sequence[EmailSummary], max_sample: int = 100
@@ -797,6 +940,17 @@ IMPORTANT:
             if len(after_think) > 1:
                 cleaned_text = after_think[-1]  # Get everything after last </think>
 
+        # Schema-constrained responses are plain JSON; parse them directly
+        stripped_text = cleaned_text.strip()
+        if stripped_text.startswith("{"):
+            try:
+                result = json.loads(stripped_text)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if isinstance(result, dict) and "categories" in result:
+                    return result
+
         # Extract JSON from response
         json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", cleaned_text, re.DOTALL)
         if json_match:
@@ -6,7 +6,7 @@ import json
 import logging
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Sequence
+from typing import Iterator, Sequence
 
 import requests
 
@@ -89,25 +89,40 @@ class OllamaEmailSummarizer(IEmailSummarizer):
             f"Batch summarizing {len(emails)} emails with {max_parallel} parallel workers..."
         )
 
-        summaries = []
+        summaries = [
+            summary for _, summary in self.summarize_stream(emails, max_inflight=max_parallel)
+        ]
 
-        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        logger.info(f"Completed batch summarization: {len(summaries)}/{len(emails)} succeeded")
+        return summaries
+
+    def summarize_stream(
+        self, emails: Sequence[Email], max_inflight: int = 3
+    ) -> Iterator[tuple[Email, EmailSummary]]:
+        """Summarize multiple emails, yielding each summary as it completes.
+
+        Failed emails yield a fallback summary instead of raising.
+
+        Args:
+            emails: Collection of emails to summarize
+            max_inflight: Maximum number of parallel requests
+
+        Yields:
+            (email, summary) pairs in completion order
+        """
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor:
             # Submit all tasks
             future_to_email = {executor.submit(self.summarize, email): email for email in emails}
 
-            # Collect results as they complete
+            # Hand out results as they complete
             for future in as_completed(future_to_email):
                 email = future_to_email[future]
                 try:
-                    summary = future.result()
-                    summaries.append(summary)
+                    yield email, future.result()
                 except Exception as e:
                     logger.warning(f"Failed to summarize email '{email.subject[:50]}': {e}")
                     # Create fallback summary
-                    summaries.append(self._create_fallback_summary(email))
-
-        logger.info(f"Completed batch summarization: {len(summaries)}/{len(emails)} succeeded")
-        return summaries
+                    yield email, self._create_fallback_summary(email)
 
     def _create_summarization_prompt(self, email: Email) -> str:
         """Create prompt for email summarization.
@@ -279,7 +294,7 @@ Your JSON output:"""
 
         # Simple heuristics to determine category
         sender_domain = email.sender.domain.lower()
-        subject_lower = email.subject.lower()
+        subject_lower = email.subject_lower
 
         # Determine dynamic category based on content
         if any(word in sender_domain for word in ["github", "gitlab"]) or any(
@@ -0,0 +1,9 @@
+"""Infrastructure caches - Persistent stores for expensive computed results."""
+
+from .embedding_cache import EmbeddingCache
+from .llm_response_cache import LLMResponseCache
+
+__all__ = [
+    "EmbeddingCache",
+    "LLMResponseCache",
+]
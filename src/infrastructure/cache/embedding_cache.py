@@ -0,0 +1,83 @@
+"""SQLite-backed cache for email embeddings."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+# Keys per SELECT; stays below SQLite's default bound-parameter limit
+_QUERY_CHUNK_SIZE = 500
+
+
+class EmbeddingCache:
+    """Persistent embedding store keyed by a content hash.
+
+    Embeddings are deterministic for a given model and input text, so a
+    key derived from both can be reused across runs. Vectors are stored and
+    returned in the configured dtype, so a cached embedding equals the one
+    it was computed as.
+    """
+
+    def __init__(self, db_path: str | Path, dtype: str = "float32") -> None:
+        """Open (and create if needed) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            dtype: Floating-point dtype of the stored vectors; callers should
+                include it in their keys when several dtypes share a file
+        """
+        self.db_path = Path(db_path)
+        self.dtype = np.dtype(dtype)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+        logger.info(f"Opened embedding cache at {self.db_path}")
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, NDArray[np.floating]]:
+        """Look up cached embeddings.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dict of key to embedding for the keys that were found
+        """
+        found = {}
+        for i in range(0, len(keys), _QUERY_CHUNK_SIZE):
+            chunk = keys[i : i + _QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                tuple(chunk),
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=self.dtype)
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, NDArray[np.floating]]]) -> None:
+        """Store embeddings, replacing any existing entries.
+
+        Args:
+            items: (key, embedding) pairs to store
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            ((key, vector.astype(self.dtype, copy=False).tobytes()) for key, vector in items),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
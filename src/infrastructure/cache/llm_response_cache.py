@@ -0,0 +1,72 @@
+"""File-backed cache for parsed LLM responses."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Stores parsed LLM responses as one JSON file per cache key.
+
+    Keys are expected to be derived from the model, its generation settings
+    and the full prompt, so a changed model or prompt never hits a stale
+    entry. Only successfully parsed responses should be stored.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        """Create the cache directory if needed.
+
+        Args:
+            cache_dir: Directory holding the cached responses
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Using LLM response cache at {self.cache_dir}")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response, or None if missing or unreadable
+        """
+        try:
+            with open(self.cache_dir / f"{key}.json", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        """Store a response, replacing any existing entry.
+
+        The file is written under a temporary name and renamed into place,
+        so concurrent readers never see a partial entry.
+
+        Args:
+            key: Cache key
+            response: Parsed response to store
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(response, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry {key}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
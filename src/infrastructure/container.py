@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
 
 from src.application.dtos.analyze_request import AnalyzeEmailsRequest
 from src.application.use_cases.analyze_emails_use_case import AnalyzeEmailsUseCase
 from src.domain.services.filter_generator import FilterGenerator
+from src.domain.services.filter_matcher import FilterMatcher
+from src.infrastructure.adapters.aho_corasick_searcher import aho_corasick_searcher_factory
 from src.infrastructure.adapters.hdbscan_clustering_adapter import (
     HDBSCANClusteringAdapter,
 )
@@ -15,12 +19,18 @@ from src.infrastructure.adapters.imap_adapter import IMAPAdapter
 from src.infrastructure.adapters.ollama_adapter import OllamaAdapter
 from src.infrastructure.adapters.ollama_email_summarizer import OllamaEmailSummarizer
 from src.infrastructure.adapters.sentence_transformer_adapter import (
+    DEFAULT_EMBEDDING_DTYPE,
     SentenceTransformerAdapter,
 )
 from src.infrastructure.adapters.sieve_file_adapter import SieveFileAdapter
+from src.infrastructure.cache.embedding_cache import EmbeddingCache
+from src.infrastructure.cache.llm_response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Default embedding cache file name, placed in the Sieve output directory
+EMBEDDING_CACHE_FILE = ".embedding_cache.sqlite"
+
 
 class Container:
     """Dependency injection container for wiring components."""
@@ -39,6 +49,7 @@ class Container:
         self._clustering_service = None
         self._filter_repository = None
         self._filter_generator = None
+        self._filter_matcher = None
         self._analyze_emails_use_case = None
 
         logger.info("Initialized dependency injection container")
@@ -77,12 +88,19 @@ class Container:
             num_predict = ai_config.get("num_predict", 6000)
             top_p = ai_config.get("top_p", 0.9)
 
+            # Optional on-disk cache of master-model responses (off by default)
+            response_cache_dir = ai_config.get("response_cache_dir")
+            response_cache = LLMResponseCache(response_cache_dir) if response_cache_dir else None
+
             self._llm_service = OllamaAdapter(
                 model=master_model,
                 base_url=ai_config.get("base_url", "http://localhost:11434"),
                 temperature=temperature,
                 num_predict=num_predict,
                 top_p=top_p,
+                structured_output=ai_config.get("structured_output", False),
+                response_cache=response_cache,
+                max_parallel_workers=ai_config.get("max_parallel_workers", 3),
             )
             logger.info(
                 f"Created OllamaAdapter (master model: {master_model}, temp={temperature})"
@@ -136,7 +154,22 @@ class Container:
             embedding_config = self.config.get("embedding", {})
             model_name = embedding_config.get("model", "all-MiniLM-L6-v2")
 
-            self._embedding_service = SentenceTransformerAdapter(model_name=model_name)
+            # Persistent embedding cache; defaults to a sidecar next to the
+            # generated Sieve output, set cache_file to "" to disable
+            cache_file = embedding_config.get("cache_file")
+            if cache_file is None:
+                output_file = self.config.get("sieve", {}).get(
+                    "output_file", "/app/output/generated.sieve"
+                )
+                cache_file = os.path.join(os.path.dirname(output_file), EMBEDDING_CACHE_FILE)
+            dtype = embedding_config.get("dtype", DEFAULT_EMBEDDING_DTYPE)
+            cache = EmbeddingCache(cache_file, dtype=dtype) if cache_file else None
+
+            self._embedding_service = SentenceTransformerAdapter(
+                model_name=model_name,
+                cache=cache,
+                dtype=dtype,
+            )
             logger.info(f"Created SentenceTransformerAdapter (model: {model_name})")
 
         return self._embedding_service
@@ -187,8 +220,6 @@ class Container:
             sieve_config = self.config.get("sieve", {})
             output_file = sieve_config.get("output_file", "/app/output/generated.sieve")
             # Extract directory from output_file
-            import os
-
             output_dir = os.path.dirname(output_file)
 
             self._filter_repository = SieveFileAdapter(default_output_dir=output_dir)
@@ -208,6 +239,27 @@ class Container:
 
         return self._filter_generator
 
+    def filter_matcher(self) -> FilterMatcher:
+        """Get or create filter matcher domain service.
+
+        Returns:
+            FilterMatcher instance, using Aho-Corasick for CONTAINS
+            conditions when pyahocorasick is installed and a process pool
+            when analysis.filter_match_workers is above 1
+        """
+        if self._filter_matcher is None:
+            # Large batches are matched on a process pool when configured
+            workers = self.config.get("analysis", {}).get("filter_match_workers", 1)
+            executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+            self._filter_matcher = FilterMatcher(
+                needle_searcher_factory=aho_corasick_searcher_factory(),
+                executor=executor,
+            )
+            logger.info(f"Created FilterMatcher instance (workers={workers})")
+
+        return self._filter_matcher
+
     def analyze_emails_use_case(self) -> AnalyzeEmailsUseCase:
         """Get or create analyze emails use case.
 
@@ -220,6 +272,7 @@ class Container:
             clustering_service = self.clustering_service()
 
             max_parallel_workers = self.config["ai"].get("max_parallel_workers", 3)
+            embedding_batch_size = self.config.get("embedding", {}).get("batch_size")
 
             self._analyze_emails_use_case = AnalyzeEmailsUseCase(
                 email_fetcher=self.email_fetcher(),
@@ -230,6 +283,7 @@ class Container:
                 max_parallel_workers=max_parallel_workers,
                 embedding_service=embedding_service,
                 clustering_service=clustering_service,
+                embedding_batch_size=embedding_batch_size,
             )
 
             # Determine mode based on available services
@@ -255,7 +309,7 @@ class Container:
 
         # Calculate since_date from months_back
         months_back = analysis_config.get("months_back", 12)
-        since_date = datetime.now() - timedelta(days=months_back * 30)
+        since_date = datetime.now(UTC) - timedelta(days=months_back * 30)
 
         return AnalyzeEmailsRequest(
             folder="INBOX",
@@ -0,0 +1,8 @@
+"""Shared helpers without external dependencies."""
+
+from .imap_list import parse_list_names, unescape_quoted
+
+__all__ = [
+    "parse_list_names",
+    "unescape_quoted",
+]
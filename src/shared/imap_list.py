@@ -0,0 +1,47 @@
+"""Parsing of IMAP LIST responses, shared by the adapter and the scripts."""
+
+from __future__ import annotations
+
+import re
+
+# LIST response line: (flags) "delimiter" mailbox, where the mailbox is either
+# a quoted string (with backslash escapes) or an atom
+_LIST_RE = re.compile(rb'\([^)]*\)\s+(?:"(?:[^"\\]|\\.)*"|NIL)\s+(?:"((?:[^"\\]|\\.)*)"|(\S+))')
+_UNESCAPE_RE = re.compile(rb"\\(.)")
+
+
+def unescape_quoted(quoted: bytes) -> bytes:
+    """Resolve the backslash escapes of an IMAP quoted string's content."""
+    return _UNESCAPE_RE.sub(rb"\1", quoted)
+
+
+def parse_list_names(folder_list: list) -> list[str]:
+    """Extract mailbox names from a raw IMAP LIST response.
+
+    Args:
+        folder_list: Response data as returned by imaplib's list()
+
+    Returns:
+        Folder names in response order
+    """
+    folders = []
+
+    for folder_data in folder_list:
+        if isinstance(folder_data, tuple):
+            # Mailbox name sent as a literal: (b'(flags) "/" {n}', b'name')
+            name = folder_data[1]
+        elif isinstance(folder_data, bytes):
+            match = _LIST_RE.match(folder_data)
+            if not match:
+                continue
+            if match.group(1) is not None:
+                name = unescape_quoted(match.group(1))
+            else:
+                name = match.group(2)
+        else:
+            continue
+
+        if name:
+            folders.append(name.decode("utf-8", errors="replace"))
+
+    return folders